@@ -1,5 +1,8 @@
+import hashlib
 import os
 import pickle
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from pathlib import Path
 
 import networkx as nx
 
@@ -33,66 +36,86 @@ def _load_graph_from_file(path):
 
 
 spring_graphs = "./SpringEmbedder/"
+cache_path = Path('data.pkl')
 
 
-def save_data(data, filename, property_name, function, overwrite=False):
-    if filename not in data:
-        data[filename] = {}
-
-    graph_data = data[filename]
-
+def save_data(graph_data, property_name, function, overwrite=False):
     if property_name not in graph_data or overwrite:
-        print(f"Obtaining {property_name} of {filename}")
+        print(f"Obtaining {property_name}")
         graph_data[property_name] = function()
 
-        with open('data.pkl', 'wb') as pickle_file:
-            pickle.dump(data, pickle_file)
-
-
-data = {}
-
-try:
-    with open('data.pkl', 'rb') as pickle_file:
-        data = pickle.load(pickle_file)
-except:
-    pass
-
-print(data)
-
-for filename in os.listdir(spring_graphs):
-    print(filename)
-    file_path = os.path.join(spring_graphs, filename)
-    if not os.path.isfile(file_path):
-        continue
 
+def compute_graph_data(file_path, graph_data):
     g = _load_graph_from_file(file_path)
     pos = boundary.normalize_positions(g, box=(-100, -100, 100, 100))
-    print(g.order())
+    print(file_path, g.order())
 
-    save_data(data, filename, "n", lambda: g.order())
-    save_data(data, filename, "m", lambda: g.number_of_edges())
-    save_data(data, filename, "m_dens", lambda: g.number_of_edges() / (g.order() * g.order()))
-    save_data(data, filename, "area", lambda: boundary.area(g))
-    save_data(data, filename, "area_tight", lambda: boundary.area_tight(g))
-    save_data(data, filename, "concentration", lambda: distribution.concentration(g))
+    save_data(graph_data, "n", lambda: g.order())
+    save_data(graph_data, "m", lambda: g.number_of_edges())
+    save_data(graph_data, "m_dens", lambda: g.number_of_edges() / (g.order() * g.order()))
+    save_data(graph_data, "area", lambda: boundary.area(g))
+    save_data(graph_data, "area_tight", lambda: boundary.area_tight(g))
+    save_data(graph_data, "concentration", lambda: distribution.concentration(g))
 
     if g.order() <= 70:
-        save_data(data, filename, "crossings", lambda: crossings.number_of_crossings(g))
+        save_data(graph_data, "crossings", lambda: crossings.number_of_crossings(g))
 
     if g.order() <= 12:
-        save_data(data, filename, "pur",
+        save_data(graph_data, "pur",
                   lambda: sym.reflective_symmetry(g, tolerance=0.085, fraction=0.5, threshold=4))
 
     if g.order() <= 100:
-        save_data(data, filename, "ref",
+        save_data(graph_data, "ref",
                   lambda: sym.edge_based_symmetry(g, sym.SymmetryType.REFLECTIVE, pos=pos))
 
-        save_data(data, filename, "tra",
+        save_data(graph_data, "tra",
                   lambda: sym.edge_based_symmetry(g, sym.SymmetryType.TRANSLATIONAL, pos=pos))
 
-        save_data(data, filename, "rot",
+        save_data(graph_data, "rot",
                   lambda: sym.edge_based_symmetry(g, sym.SymmetryType.ROTATIONAL, pos=pos))
 
-    save_data(data, filename, "str", lambda: sym.stress(g, pos))
-    save_data(data, filename, "for", lambda: sym.even_neighborhood_distribution(g, pos))
-    save_data(data, filename, "viz", lambda: sym.visual_symmetry(g, pos))
+    save_data(graph_data, "str", lambda: sym.stress(g, pos))
+    save_data(graph_data, "for", lambda: sym.even_neighborhood_distribution(g, pos))
+    save_data(graph_data, "viz", lambda: sym.visual_symmetry(g, pos))
+
+    return graph_data
+
+
+def write_cache(data):
+    # Write to a temporary file first, so an interrupted run cannot corrupt the results gathered so far
+    temporary_path = cache_path.with_suffix('.tmp')
+    with open(temporary_path, 'wb') as pickle_file:
+        pickle.dump(data, pickle_file)
+    os.replace(temporary_path, cache_path)
+
+
+if __name__ == '__main__':
+    data = {}
+    if cache_path.exists():
+        with open(cache_path, 'rb') as pickle_file:
+            data = pickle.load(pickle_file)
+
+    print(data)
+
+    graph_files = {}
+    for filename in os.listdir(spring_graphs):
+        file_path = os.path.join(spring_graphs, filename)
+        if not os.path.isfile(file_path):
+            continue
+
+        # Key the results by the file contents, so regenerated graphs are measured again and copies are measured once
+        with open(file_path, 'rb') as graph_file:
+            graph_files[hashlib.blake2b(graph_file.read(), digest_size=16).hexdigest()] = file_path
+
+    # Drop results of drawings that no longer exist, so the plots only ever see the current graphs
+    data = {graph_key: data[graph_key] for graph_key in graph_files if graph_key in data}
+
+    # The graphs are independent of each other, so each one is handled by its own worker process. The results are
+    # merged and persisted by this process only.
+    with ProcessPoolExecutor() as executor:
+        futures = {executor.submit(compute_graph_data, file_path, data.get(graph_key, {})): graph_key
+                   for graph_key, file_path in graph_files.items()}
+
+        for future in as_completed(futures):
+            data[futures[future]] = future.result()
+            write_cache(data)
@@ -1,42 +1,60 @@
+import argparse
 import os
 import random
 
 import networkx as nx
+import numpy as np
 
 from gdMetriX import boundary
 
-# Random
-for i in range(0, 0):
-    print(i)
-    for density in range(10, 100, 10):
-        try:
-            os.makedirs(f"./RandomGraphs/{density}")
-        except:
-            pass
-        random_graph = nx.fast_gnp_random_graph(i, density / 100.0, random.randint(1, 10000000))
-        random_embedding = {n: [random.uniform(0, 1), random.uniform(0, 1)] for n in range(0, i + 1)}
-        # nx.set_node_attributes(random_graph, random_embedding, "pos")
-        # pos2 = nx.spring_layout(g)
-        # pos2 = boundary.normalize_positions(g, pos2, (0, 0, 1, 1))
-        # nx.set_node_attributes(g, pos2, "pos")
-
-        for node in random_graph.nodes:
-            random_graph.nodes[node]['x'] = random_embedding[node][0]
-            random_graph.nodes[node]['y'] = random_embedding[node][1]
-
-        nx.write_graphml(random_graph, f"./RandomGraphs/{density}/{i:03}.graphml")
-
-
-# Spring embedder
-for i in range(0, 255):
-    print(i)
-    g = nx.fast_gnp_random_graph(random.randint(5, 200), random.uniform(0, 1), random.randint(1, 10000000))
-    pos2 = nx.spring_layout(g)
-    pos2 = boundary.normalize_positions(g, pos2, (0, 0, 1, 1))
-    # nx.set_node_attributes(g, pos2, "pos")
-
-    for node in g.nodes:
-        g.nodes[node]['x'] = pos2[node][0]
-        g.nodes[node]['y'] = pos2[node][1]
-
-    nx.write_graphml(g, f"./SpringEmbedder/{i}.graphml")
+
+def fast_er(n, p, seed):
+    """Samples a G(n, p) random graph by drawing all candidate edges of the upper triangle at once."""
+    rng = np.random.default_rng(seed)
+    sources, targets = np.triu_indices(n, 1)
+    selected = rng.random(len(sources)) < p
+
+    g = nx.empty_graph(n)
+    g.add_edges_from(zip(sources[selected].tolist(), targets[selected].tolist()))
+    return g
+
+
+def generate_random_graphs(sizes):
+    for i in range(0, sizes):
+        print(i)
+        for density in range(10, 100, 10):
+            try:
+                os.makedirs(f"./RandomGraphs/{density}")
+            except:
+                pass
+            random_graph = fast_er(i, density / 100.0, random.randint(1, 10000000))
+            random_embedding = {n: [random.uniform(0, 1), random.uniform(0, 1)] for n in range(0, i + 1)}
+
+            random_graph.add_nodes_from((node, {'x': random_embedding[node][0], 'y': random_embedding[node][1]})
+                                        for node in random_graph.nodes)
+
+            nx.write_graphml(random_graph, f"./RandomGraphs/{density}/{i:03}.graphml")
+
+
+def generate_spring_embedder_graphs(count):
+    for i in range(0, count):
+        print(i)
+        g = fast_er(random.randint(5, 200), random.uniform(0, 1), random.randint(1, 10000000))
+        pos2 = nx.spring_layout(g)
+        pos2 = boundary.normalize_positions(g, pos2, (0, 0, 1, 1))
+
+        g.add_nodes_from((node, {'x': pos2[node][0], 'y': pos2[node][1]}) for node in g.nodes)
+
+        nx.write_graphml(g, f"./SpringEmbedder/{i}.graphml")
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Generates the random graphs used by the analysis")
+    parser.add_argument('--random-sizes', type=int, default=0,
+                        help="Generate uniformly embedded random graphs with 0 to the given number of nodes")
+    parser.add_argument('--spring-count', type=int, default=255,
+                        help="Number of spring embedded random graphs to generate")
+    args = parser.parse_args()
+
+    generate_random_graphs(args.random_sizes)
+    generate_spring_embedder_graphs(args.spring_count)
@@ -1,3 +1,4 @@
+import argparse
 import pickle
 
 import pandas as pd
@@ -9,96 +10,94 @@ import numpy as np
 
 import gdMetriX
 
-subways = list(gdMetriX.iterate_dataset('subways'))
 
-scale_factor = 0.9
-plt.figure(figsize=(10.5*scale_factor, 5.25*scale_factor))
-i = 0
-for name, g in subways:
-    ax = plt.subplot(3, 5, i + 1)
-    ax.set_title(name)
+def plot_subways():
+    subways = list(gdMetriX.iterate_dataset('subways'))
 
-    ax.set_axis_off()
+    scale_factor = 0.9
+    plt.figure(figsize=(10.5*scale_factor, 5.25*scale_factor))
+    i = 0
+    for name, g in subways:
+        ax = plt.subplot(3, 5, i + 1)
+        ax.set_title(name)
 
-    pos = gdMetriX.get_node_positions(g)
-    edge_lengths = [gdMetriX.euclidean_distance(pos[edge[0]], pos[edge[1]]) for edge in g.edges()]
-    edge_pos = [gdMetriX.Vector.from_point(pos[edge[0]]).mid(gdMetriX.Vector.from_point(pos[edge[1]])) for edge in
-                g.edges()]
+        ax.set_axis_off()
 
-    x_values = [x for x, y in pos.values()]
-    y_values = [y for x, y in pos.values()]
+        pos = gdMetriX.get_node_positions(g)
+        edge_lengths = [gdMetriX.euclidean_distance(pos[edge[0]], pos[edge[1]]) for edge in g.edges()]
+        edge_pos = [gdMetriX.Vector.from_point(pos[edge[0]]).mid(gdMetriX.Vector.from_point(pos[edge[1]])) for edge in
+                    g.edges()]
 
-    heatmap = gdMetriX.heatmap(g, edge_pos, edge_lengths, 20)
-    plt.tight_layout()
-    ax.imshow(heatmap, cmap='viridis', interpolation='nearest')
+        x_values = [x for x, y in pos.values()]
+        y_values = [y for x, y in pos.values()]
 
-    i += 1
+        heatmap = gdMetriX.heatmap(g, edge_pos, edge_lengths, 20)
+        plt.tight_layout()
+        ax.imshow(heatmap, cmap='viridis', interpolation='nearest')
 
-plt.tight_layout()
-#plt.savefig(f"../poster/subways_edge_length.svg")
-plt.show()
+        i += 1
 
-computed_symmetry = {key: gdMetriX.visual_symmetry(value) for key, value in subways}
+    plt.tight_layout()
+    #plt.savefig(f"../poster/subways_edge_length.svg")
+    plt.show()
 
-# sorted_subways = dict(sorted(subways.items(), key=lambda g: computed_symmetry[g[0]]))
-subways.sort(key=lambda g: computed_symmetry[g[0]])
+    computed_symmetry = {key: gdMetriX.visual_symmetry(value) for key, value in subways}
 
-plt.figure(figsize=(10.25, 5.25))
-i = 0
-for name, graph in subways:
-    # Setup the matplotlib axis
-    ax = plt.subplot(3, 5, i + 1)
-    ax.set_title(name)
+    # sorted_subways = dict(sorted(subways.items(), key=lambda g: computed_symmetry[g[0]]))
+    subways.sort(key=lambda g: computed_symmetry[g[0]])
 
-    # Read the node positions from the graph
-    pos = gdMetriX.get_node_positions(graph)
+    plt.figure(figsize=(10.25, 5.25))
+    i = 0
+    for name, graph in subways:
+        # Setup the matplotlib axis
+        ax = plt.subplot(3, 5, i + 1)
+        ax.set_title(name)
 
-    # Draw on the axis using networkX
-    nx.draw_networkx_edges(graph, pos, ax=ax, node_size=10)
-    nx.draw_networkx_nodes(graph, pos, ax=ax, node_size=10)
+        # Read the node positions from the graph
+        pos = gdMetriX.get_node_positions(graph)
 
-    i += 1
+        # Draw on the axis using networkX
+        nx.draw_networkx_edges(graph, pos, ax=ax, node_size=10)
+        nx.draw_networkx_nodes(graph, pos, ax=ax, node_size=10)
 
-plt.tight_layout()
-plt.savefig(f"../poster/symmetry_sorted.svg")
-plt.show()
+        i += 1
+
+    plt.tight_layout()
+    plt.savefig(f"../poster/symmetry_sorted.svg")
+    plt.show()
 
-x = 1 / 0
 
 def smooth(y, box_pts):
-    box = np.ones(box_pts) / box_pts
-    y_smooth = np.convolve(y, box, mode='same')
+    y = np.asarray(y, dtype=np.float64)
     n = len(y)
+    if n == 0:
+        raise ValueError("Cannot smooth an empty sequence")
+
+    # Moving average via a cumulative sum, equal to np.convolve(y, np.ones(box_pts) / box_pts, mode='same')
+    padded = np.pad(y, box_pts - 1)
+    cumulative = np.cumsum(np.insert(padded, 0, 0.0))
+    offset = (box_pts - 1) // 2
+    y_smooth = (cumulative[offset + box_pts:offset + box_pts + n] - cumulative[offset:offset + n]) / box_pts
+
     y_smooth[n - 1] = y[n - 1]
     return y_smooth
 
 
-def _append(list, data, graph, property):
-    if property in data[graph]:
-        list.append(data[graph][property])
-    else:
-        list.append(None)
-
+# Draw correlation matrix
+def _property_arrays(data, properties):
+    # One preallocated float column per property, missing values are NaN (which pandas treats as missing as well)
+    columns = {property: np.full(len(data), np.nan) for property in properties}
 
-data = {}
+    for i, graph_data in enumerate(data.values()):
+        for property in properties:
+            if property in graph_data and graph_data[property] is not None:
+                columns[property][i] = graph_data[property]
 
-with open('data.pkl', 'rb') as pickle_file:
-    data = pickle.load(pickle_file)
+    return columns
 
 
-# Draw correlation matrix
 def correlation_matrix(data, properties):
-    cor_data = {property: [] for property in properties}
-
-    for graph_key, graph_data in data.items():
-
-        for property in properties:
-            if property in graph_data:
-                cor_data[property].append(graph_data[property])
-            else:
-                cor_data[property].append(None)
-
-    df = pd.DataFrame(cor_data)
+    df = pd.DataFrame(_property_arrays(data, properties))
     sns.pairplot(df, diag_kind='kde')
     plt.savefig('sym_scatter.svg')
     plt.show()
@@ -111,16 +110,7 @@ def correlation_matrix(data, properties):
 
 
 def correlation_matrix_2(data, row_prop, column_prop):
-    cor_data = {property: [] for property in row_prop + column_prop}
-    for graph_key, graph_data in data.items():
-
-        for property in row_prop + column_prop:
-            if property in graph_data:
-                cor_data[property].append(graph_data[property])
-            else:
-                cor_data[property].append(None)
-
-    df = pd.DataFrame(cor_data)
+    df = pd.DataFrame(_property_arrays(data, row_prop + column_prop))
 
     # Scatter plot
     fig, axes = plt.subplots(len(row_prop), len(column_prop), figsize=(len(row_prop) * 3, len(column_prop) * 3))
@@ -156,21 +146,22 @@ def correlation_matrix_2(data, row_prop, column_prop):
     plt.show()
 
 
-# correlation_matrix(data, ['pur', 'tra', 'rot', 'ref', 'str', 'for', 'viz'])
-# correlation_matrix_2(data, ['pur', 'tra', 'rot', 'ref', 'str', 'for', 'viz'],
-#                     ['n', 'm', 'm_dens', 'area', 'area_tight', 'concentration', 'crossings'])
+def plot_correlation():
+    with open('data.pkl', 'rb') as pickle_file:
+        data = pickle.load(pickle_file)
 
-# Time data
+    correlation_matrix(data, ['pur', 'tra', 'rot', 'ref', 'str', 'for', 'viz'])
+    correlation_matrix_2(data, ['pur', 'tra', 'rot', 'ref', 'str', 'for', 'viz'],
+                         ['n', 'm', 'm_dens', 'area', 'area_tight', 'concentration', 'crossings'])
 
-timedata = {}
 
-with open('timedata.pkl', 'rb') as pickle_file:
-    timedata = pickle.load(pickle_file)
+# Time data
 
 
 def _plot(plt, x_values, y_values, label):
-    filtered_x = [a for a, b in zip(x_values, y_values) if a is not None and b is not None]
-    filtered_y = [b for a, b in zip(x_values, y_values) if a is not None and b is not None]
+    x_values, y_values = np.asarray(x_values, dtype=float), np.asarray(y_values, dtype=float)
+    available = ~np.isnan(x_values) & ~np.isnan(y_values)
+    filtered_x, filtered_y = x_values[available], y_values[available]
 
     try:
         filtered_y = smooth(filtered_y, 3)
@@ -181,17 +172,11 @@ def _plot(plt, x_values, y_values, label):
 
 
 def draw_data(data, properties, names, filename, xlim=None, ylim=None):
-    property_dic = {property: [] for property in properties}
-    property_dic['n'] = []
-    property_dic['den'] = []
-
-    for graph in data:
-        for key in property_dic:
-            _append(property_dic[key], data, graph, key)
+    property_dic = _property_arrays(data, properties + ['n', 'den'])
 
     sorted_indices = np.argsort(property_dic['n'])
     for key, property in property_dic.items():
-        property_dic[key] = np.array(property)[sorted_indices]
+        property_dic[key] = property[sorted_indices]
 
     width = 2
     height = 2
@@ -200,16 +185,16 @@ def draw_data(data, properties, names, filename, xlim=None, ylim=None):
     axes = axes.flatten()
 
     if ylim is None:
-        ylim = max(max(y for y in property_dic[property] if y is not None) for property in properties if
-                   any(y is not None for y in property_dic[property]))
+        ylim = max(np.nanmax(property_dic[property]) for property in properties if
+                   not np.all(np.isnan(property_dic[property])))
     if xlim is None:
-        xlim = max(x for x in property_dic['n'] if x is not None)
+        xlim = np.nanmax(property_dic['n'])
 
     for i in range(1, 4):
         density_value = 10 + (i-1) * 40
 
-        filtered_dic = {property: [x for x, t in zip(property_dic[property], property_dic['den']) if t == density_value]
-                        for property in property_dic if property != 'den'}
+        with_density = property_dic['den'] == density_value
+        filtered_dic = {property: values[with_density] for property, values in property_dic.items() if property != 'den'}
 
         print(filtered_dic)
 
@@ -239,45 +224,33 @@ def draw_data(data, properties, names, filename, xlim=None, ylim=None):
     plt.savefig(filename)
     plt.show()
 
-    """
-    for i in range(1, 10):
-        plt.figure(figsize=(6, 4), dpi=300)
 
-        density_value = i * 10
+def plot_runtime():
+    with open('timedata.pkl', 'rb') as pickle_file:
+        timedata = pickle.load(pickle_file)
 
-        filtered_dic = {property: [x for x, t in zip(property_dic[property], property_dic['den']) if t == density_value]
-                        for property in property_dic if property != 'den'}
+    draw_data(timedata, ['pur', 'tra', 'rot', 'ref', 'str', 'for', 'viz'],
+              ['Node-based', 'Edge-based - translational', 'Edge-based - rotational', 'Edge-based - reflective',
+               'Stress-based',
+               'Even neighborhood distribution', 'Visual Symmetry'],
+              "../poster/sym_runtime_all.svg"
+              )
 
-        for property in properties:
-            _plot(plt, filtered_dic['n'], filtered_dic[property], str(i))
+    # draw_data(timedata, ['pur', 'tra', 'rot', 'ref'],
+    #           ['Node-based', 'Edge-based - translational', 'Edge-based - rotational', 'Edge-based - reflective'],
+    #           "sym_runtime_presentation.pdf"
+    #           )
 
-        # plt.figure(figsize=(10, 8))
+    # draw_data(timedata, ['str', 'for', 'viz'],
+    #           ['Stress',
+    #            'Even neighborhood distribution', 'Pixel-based'],
+    #           "sym_runtime.svg"
+    #           )
 
-        plt.xlabel('n')
-        plt.ylabel('Time [s]')
-        plt.ylim(0, ylim)
-        plt.xlim(0, xlim)
 
-        plt.tight_layout()
-        plt.savefig(f"{i}.png")
-        plt.show(
-    """
-
-
-draw_data(timedata, ['pur', 'tra', 'rot', 'ref', 'str', 'for', 'viz'],
-          ['Node-based', 'Edge-based - translational', 'Edge-based - rotational', 'Edge-based - reflective',
-           'Stress-based',
-           'Even neighborhood distribution', 'Visual Symmetry'],
-          "../poster/sym_runtime_all.svg"
-          )
-
-# draw_data(timedata, ['pur', 'tra', 'rot', 'ref'],
-#           ['Node-based', 'Edge-based - translational', 'Edge-based - rotational', 'Edge-based - reflective'],
-#           "sym_runtime_presentation.pdf"
-#           )
-
-# draw_data(timedata, ['str', 'for', 'viz'],
-#           ['Stress',
-#            'Even neighborhood distribution', 'Pixel-based'],
-#           "sym_runtime.svg"
-#           )
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Plots the results of the analysis")
+    parser.add_argument('--phase', choices=['subways', 'correlation', 'runtime'], default='subways')
+    args = parser.parse_args()
+
+    {'subways': plot_subways, 'correlation': plot_correlation, 'runtime': plot_runtime}[args.phase]()
@@ -1,7 +1,9 @@
+import argparse
 import concurrent.futures
 import os
 import pickle
-import timeit
+import time
+from pathlib import Path
 
 import networkx as nx
 
@@ -40,6 +42,7 @@ kmp_node_cutoff = 80000
 kmp_edge_cutoff = 1000000000
 
 spring_graphs = "./RandomGraphs/"
+cache_path = Path('timedata.pkl')
 
 
 def save_data(data, filename, property_name, function, overwrite=False):
@@ -52,37 +55,35 @@ def save_data(data, filename, property_name, function, overwrite=False):
         print(f"Obtaining {property_name} of {filename}")
         graph_data[property_name] = function()
 
-        with open('timedata.pkl', 'wb') as pickle_file:
+        # Write to a temporary file first, so an interrupted run cannot corrupt the results gathered so far
+        temporary_path = cache_path.with_suffix('.tmp')
+        with open(temporary_path, 'wb') as pickle_file:
             pickle.dump(data, pickle_file)
+        os.replace(temporary_path, cache_path)
 
 
-data = {}
-try:
-    with open('timedata.pkl', 'rb') as pickle_file:
-        data = pickle.load(pickle_file)
-except:
-    pass
-
-print(data)
+def time_function(func, repetitions=1):
+    """Returns the fastest of the given number of runs of func in seconds."""
+    timings = []
+    for _ in range(repetitions):
+        start_time = time.perf_counter_ns()
+        func()
+        timings.append(time.perf_counter_ns() - start_time)
+    return min(timings) / 1e9
 
 
 def target(func, result_queue):
-    start_time = timeit.default_timer()
-    func()
-    end_time = timeit.default_timer()
-    result_queue.put(end_time - start_time)
+    result_queue.put(time_function(func))
 
 
 def time_function_with_timeout(func, returnValue):
     timeout = 12
 
     with concurrent.futures.ThreadPoolExecutor() as executor:
-        future = executor.submit(func)
+        # Time inside the worker, so neither thread start-up nor the wait for the result is measured
+        future = executor.submit(time_function, func)
         try:
-            start_time = timeit.default_timer()
-            future.result(timeout=timeout)
-            end_time = timeit.default_timer()
-            return end_time - start_time
+            return future.result(timeout=timeout)
         except concurrent.futures.TimeoutError:
             returnValue.val = True
             print("Timeout")
@@ -115,59 +116,76 @@ class ReturnValue:
     val = False
 
 
-for filename in os.listdir(spring_graphs):
-    folder_path = os.path.join(spring_graphs, filename)
-    pur_timeouted = ReturnValue()
-    tra_timeouted = ReturnValue()
-    rot_timeouted = ReturnValue()
-    ref_timeouted = ReturnValue()
-    str_timeouted = ReturnValue()
-    for_timeouted = ReturnValue()
-    viz_timeouted = ReturnValue()
-
-    for filename_2 in os.listdir(folder_path):
-        filename_2 = os.path.join(folder_path, filename_2)
-
-        g = _load_graph_from_file(filename_2)
-
-        save_data(data, filename_2, "n", lambda: g.order())
-        save_data(data, filename_2, "m", lambda: g.number_of_edges())
-        save_data(data, filename_2, "den", lambda: int(filename))
-
-        print(sym.even_neighborhood_distribution(g))
-
-        """
-        if not pur_timeouted.val:  # and g.order() <= purchase_node_cutoff and g.number_of_edges() <= purchase_edge_cutoff:
-            save_data(data, filename_2, "pur",
-                      lambda: time_function_with_timeout(
-                          lambda: sym.reflective_symmetry(g), pur_timeouted),
-                      overwrite=False)
-        # if (g.order() <= kmp_node_cutoff and g.number_of_edges() <= kmp_edge_cutoff):
-        if not tra_timeouted.val:
-            save_data(data, filename_2, "tra",
-                      lambda: time_function_with_timeout(
-                          lambda: sym.edge_based_symmetry(g, sym.SymmetryType.TRANSLATIONAL), tra_timeouted))
-        if not rot_timeouted.val:
-            save_data(data, filename_2, "rot",
-                      lambda: time_function_with_timeout(
-                          lambda: sym.edge_based_symmetry(g, sym.SymmetryType.ROTATIONAL), rot_timeouted))
-        if not ref_timeouted.val:
-            save_data(data, filename_2, "ref",
-                      lambda: time_function_with_timeout(
-                          lambda: sym.edge_based_symmetry(g, sym.SymmetryType.REFLECTIVE), ref_timeouted))
-        """
-        if not str_timeouted.val:
-            save_data(data, filename_2, "str",
-                      lambda: time_function_with_timeout(
-                          lambda : sym.stress(g), str_timeouted
-                      ))
-        if not for_timeouted.val:
-            save_data(data, filename_2, "for",
-                      lambda: time_function_with_timeout(
-                          lambda: sym.even_neighborhood_distribution(g), for_timeouted
-                      ))
-        if not viz_timeouted.val:
-            save_data(data, filename_2, "viz",
-                      lambda: time_function_with_timeout(
-                          lambda: sym.visual_symmetry(g), for_timeouted
-                      ))
\ No newline at end of file
+def time_graphs(data, edge_based=False):
+    for filename in os.listdir(spring_graphs):
+        folder_path = os.path.join(spring_graphs, filename)
+        pur_timeouted = ReturnValue()
+        tra_timeouted = ReturnValue()
+        rot_timeouted = ReturnValue()
+        ref_timeouted = ReturnValue()
+        str_timeouted = ReturnValue()
+        for_timeouted = ReturnValue()
+        viz_timeouted = ReturnValue()
+
+        for filename_2 in os.listdir(folder_path):
+            filename_2 = os.path.join(folder_path, filename_2)
+
+            g = _load_graph_from_file(filename_2)
+
+            save_data(data, filename_2, "n", lambda: g.order())
+            save_data(data, filename_2, "m", lambda: g.number_of_edges())
+            save_data(data, filename_2, "den", lambda: int(filename))
+
+            print(sym.even_neighborhood_distribution(g))
+
+            if edge_based:
+                if not pur_timeouted.val:  # and g.order() <= purchase_node_cutoff and g.number_of_edges() <= purchase_edge_cutoff:
+                    save_data(data, filename_2, "pur",
+                              lambda: time_function_with_timeout(
+                                  lambda: sym.reflective_symmetry(g), pur_timeouted),
+                              overwrite=False)
+                # if (g.order() <= kmp_node_cutoff and g.number_of_edges() <= kmp_edge_cutoff):
+                if not tra_timeouted.val:
+                    save_data(data, filename_2, "tra",
+                              lambda: time_function_with_timeout(
+                                  lambda: sym.edge_based_symmetry(g, sym.SymmetryType.TRANSLATIONAL), tra_timeouted))
+                if not rot_timeouted.val:
+                    save_data(data, filename_2, "rot",
+                              lambda: time_function_with_timeout(
+                                  lambda: sym.edge_based_symmetry(g, sym.SymmetryType.ROTATIONAL), rot_timeouted))
+                if not ref_timeouted.val:
+                    save_data(data, filename_2, "ref",
+                              lambda: time_function_with_timeout(
+                                  lambda: sym.edge_based_symmetry(g, sym.SymmetryType.REFLECTIVE), ref_timeouted))
+
+            if not str_timeouted.val:
+                save_data(data, filename_2, "str",
+                          lambda: time_function_with_timeout(
+                              lambda : sym.stress(g), str_timeouted
+                          ))
+            if not for_timeouted.val:
+                save_data(data, filename_2, "for",
+                          lambda: time_function_with_timeout(
+                              lambda: sym.even_neighborhood_distribution(g), for_timeouted
+                          ))
+            if not viz_timeouted.val:
+                save_data(data, filename_2, "viz",
+                          lambda: time_function_with_timeout(
+                              lambda: sym.visual_symmetry(g), for_timeouted
+                          ))
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Measures the running time of the symmetry metrics")
+    parser.add_argument('--edge-based', action='store_true',
+                        help="Also time the node-based and edge-based symmetry metrics")
+    args = parser.parse_args()
+
+    data = {}
+    if cache_path.exists():
+        with open(cache_path, 'rb') as pickle_file:
+            data = pickle.load(pickle_file)
+
+    print(data)
+
+    time_graphs(data, edge_based=args.edge_based)
@@ -21,7 +21,7 @@
 import math
 from collections import namedtuple
 from enum import Enum
-from typing import List, Optional, Iterable
+from typing import List, Optional, Callable, Tuple
 
 from gdMetriX.common import numeric
 
@@ -48,11 +48,13 @@ CrossingPoint = namedtuple("CrossingPoint", "x y")
 CrossingLine = namedtuple("CrossingLine", "point_a point_b")
 
 
-def __greater_than__(a: float, b: float) -> bool:
-    if __numeric_eq__(a, b):
-        return False
+# The comparisons below are called millions of times during a sweep, so they call math.isclose directly instead of
+# going through __numeric_eq__
 
-    return a > b
+
+def __greater_than__(a: float, b: float) -> bool:
+    # Only check for equality if it could matter
+    return a > b and not math.isclose(a, b, abs_tol=__precision)
 
 
 def __numeric_eq__(a: numeric, b: numeric) -> bool:
@@ -74,15 +76,17 @@ def __points_equal__(crossing_a, crossing_b):
                 __points_equal__(__point_to_crossing(crossing_a.point_b), __point_to_crossing(crossing_b.point_a))
         )
 
-    return __numeric_eq__(crossing_a[0], crossing_b[0]) and __numeric_eq__(crossing_a[1], crossing_b[1])
+    return (math.isclose(crossing_a[0], crossing_b[0], abs_tol=__precision)
+            and math.isclose(crossing_a[1], crossing_b[1], abs_tol=__precision))
 
 
 def _less_than(point1, point2):
     """
     Defines the order of the event points
     """
-    return __greater_than__(point1[1], point2[1]) or (
-            __numeric_eq__(point1[1], point2[1]) and __greater_than__(point2[0], point1[0]))
+    if not math.isclose(point1[1], point2[1], abs_tol=__precision):
+        return point1[1] > point2[1]
+    return point2[0] > point1[0] and not math.isclose(point2[0], point1[0], abs_tol=__precision)
 
 
 class Crossing:
@@ -90,9 +94,11 @@ class Crossing:
         Represents a single crossing point
     """
 
-    def __init__(self, pos, involved_edges):
+    def __init__(self, pos, involved_edges, edge_infos=None):
         self.pos = pos
         self.involved_edges = involved_edges
+        # Sweep line representations of the involved edges already known when the crossing was found, keyed by edge
+        self.edge_infos = {} if edge_infos is None else {info.edge: info for info in edge_infos}
 
     def __str__(self):
         return "[{}, edges: {}]".format(self.pos, sorted(self.involved_edges))
@@ -183,6 +189,8 @@ class BBTNode(object):
         Node for the ParameterizedBalancedBinarySearchTree
     """
 
+    __slots__ = ('content', 'left', 'right', 'height')
+
     def __init__(self, content):
         self.content = content
         self.left = None
@@ -216,41 +224,67 @@ class ParameterizedBalancedBinarySearchTree:
         :rtype: None
         """
 
-        def __insert__(root: BBTNode) -> BBTNode:
+        # Walk down to the insertion point, remembering the path to rebalance it on the way back up
+        path = []
+        node = self.root
+        while node is not None:
+            went_right = node.content.less_than(item, key_parameter)
+            path.append((node, went_right))
+            node = node.right if went_right else node.left
 
-            if root is None:
-                root = BBTNode(item)
-                return root
+        self.__link_and_rebalance__(path, BBTNode(item),
+                                    lambda root: self.__rebalance_after_insert__(root, item, key_parameter))
+        self.__length__ += 1
 
-            if root.content.less_than(item, key_parameter):
-                root.right = __insert__(root.right)
+    def __link_and_rebalance__(self, path: List[Tuple[BBTNode, bool]], subtree: Optional[BBTNode],
+                               rebalance: Callable[[BBTNode], BBTNode]) -> None:
+        # Links the changed subtree into the nodes along the path and rebalances them from the bottom up
+        while path:
+            node, went_right = path.pop()
+            if went_right:
+                node.right = subtree
             else:
-                root.left = __insert__(root.left)
-
-            self.__update_height__(root)
-
-            balance = self.__get_balance__(root)
-            if balance > 1:
-                # Tree is unbalanced with longer side on the left
-
-                if not root.left.content.less_than(item, key_parameter):
-                    return self.__right_rotate__(root)
-                else:
-                    root.left = self.__left_rotate__(root.left)
-                    return self.__right_rotate__(root)
-            elif balance < -1:
-                # Tree is unbalanced with longer side on the right
-
-                if root.right.content.less_than(item, key_parameter):
-                    return self.__left_rotate__(root)
-                else:
-                    root.right = self.__right_rotate__(root.right)
-                    return self.__left_rotate__(root)
+                node.left = subtree
+
+            height = node.height
+            subtree = rebalance(node)
+
+            if subtree.height == height:
+                # Neither the height nor the balance of any ancestor changes, only the parent has to point to the
+                # subtree in case it was rotated
+                if path:
+                    parent, went_right = path[-1]
+                    if went_right:
+                        parent.right = subtree
+                    else:
+                        parent.left = subtree
+                    return
+                break
+
+        self.root = subtree
+
+    def __rebalance_after_insert__(self, root: BBTNode, item: SortableObject, key_parameter: object) -> BBTNode:
+        self.__update_height__(root)
+
+        balance = self.__get_balance__(root)
+        if balance > 1:
+            # Tree is unbalanced with longer side on the left
+
+            if not root.left.content.less_than(item, key_parameter):
+                return self.__right_rotate__(root)
+            else:
+                root.left = self.__left_rotate__(root.left)
+                return self.__right_rotate__(root)
+        elif balance < -1:
+            # Tree is unbalanced with longer side on the right
 
-            return root
+            if root.right.content.less_than(item, key_parameter):
+                return self.__left_rotate__(root)
+            else:
+                root.right = self.__right_rotate__(root.right)
+                return self.__left_rotate__(root)
 
-        self.root = __insert__(self.root)
-        self.__length__ += 1
+        return root
 
     def __left_rotate__(self, node: BBTNode) -> BBTNode:
         old_right = node.right
@@ -303,25 +337,19 @@ class ParameterizedBalancedBinarySearchTree:
         :rtype: Optional[object]
         """
 
-        def __get_left__(root) -> Optional[BBTNode]:
+        # Walk down towards the key, then pick the best candidate from the bottom up
+        path = []
+        node = self.root
+        while node is not None:
+            is_left_of_key = node.content.less_than_key(key_value, key_parameter)
+            path.append((node, is_left_of_key))
+            node = node.right if is_left_of_key else node.left
 
-            if root is None:
-                return None
-
-            # Get candidate from children
-            if root.content.less_than_key(key_value, key_parameter):
-                candidate = __get_left__(root.right)
-            else:
-                candidate = __get_left__(root.left)
+        left_node = None
+        for node, is_left_of_key in reversed(path):
+            if is_left_of_key and (left_node is None or left_node.content.less_than(node.content, key_parameter)):
+                left_node = node
 
-            # Check if current root is a better candidate
-            if root.content.less_than_key(key_value, key_parameter):
-                if candidate is None or candidate.content.less_than(root.content, key_parameter):
-                    return root
-
-            return candidate
-
-        left_node = __get_left__(self.root)
         return None if left_node is None else left_node.content
 
     def get_right(self, key_value: numeric, key_parameter: object) -> Optional[SortableObject]:
@@ -336,31 +364,28 @@ class ParameterizedBalancedBinarySearchTree:
         :rtype: Optional[object]
         """
 
-        def __get_right__(root: BBTNode) -> Optional[BBTNode]:
+        # Walk down towards the key, then pick the best candidate from the bottom up
+        path = []
+        node = self.root
+        while node is not None:
+            is_right_of_key = node.content.greater_than_key(key_value, key_parameter)
+            path.append((node, is_right_of_key))
+            node = node.left if is_right_of_key else node.right
 
-            if root is None:
-                return None
+        right_node = None
+        for node, is_right_of_key in reversed(path):
+            if is_right_of_key and (right_node is None or node.content.less_than(right_node.content, key_parameter)):
+                right_node = node
 
-            # Get candidate from children
-            if not root.content.greater_than_key(key_value, key_parameter):
-                candidate = __get_right__(root.right)
-            else:
-                candidate = __get_right__(root.left)
-
-            # Check if current root is a better candidate
-            if root.content.greater_than_key(key_value, key_parameter):
-                if candidate is None or root.content.less_than(candidate.content, key_parameter):
-                    return root
-
-            return candidate
-
-        right_node = __get_right__(self.root)
         return None if right_node is None else right_node.content
 
-    def __get_min__(self, root: BBTNode) -> Optional[BBTNode]:
-        if root is None or root.left is None:
-            return root
-        return self.__get_min__(root.left)
+    @staticmethod
+    def __get_min__(root: BBTNode) -> Optional[BBTNode]:
+        if root is None:
+            return None
+        while root.left is not None:
+            root = root.left
+        return root
 
     def get_min(self) -> Optional[SortableObject]:
         """
@@ -384,72 +409,74 @@ class ParameterizedBalancedBinarySearchTree:
         :return: None
         :rtype: None
         """
-        found_item = False
+        path = []
+        node = self.root
+        value = item
+        replacement = None
 
-        def __remove__(root: BBTNode, value: object) -> Optional[BBTNode]:
-            nonlocal found_item
+        while True:
+            # Walk down to the node holding the value, remembering the path to rebalance it on the way back up
+            while node is not None and not value == node.content:
+                went_right = node.content.less_than(value, key_parameter)
+                path.append((node, went_right))
+                node = node.right if went_right else node.left
 
-            if root is None:
-                return None
-
-            if value == root.content:
-                # We have found the actual root that should be deleted
-                found_item = True
+            if node is None:
+                # Nothing to unlink, so the tree keeps its shape
+                return
 
-                # If either the left or right is None, we can simply move the node one up
-                if root.left is None:
-                    return root.right
-                elif root.right is None:
-                    return root.left
+            # If either the left or right is None, we can simply move the node one up
+            if node.left is None:
+                replacement = node.right
+                break
+            if node.right is None:
+                replacement = node.left
+                break
 
-                # Move min up and delete min down the road
-                temp = self.__get_min__(root.right)
-                root.content = temp.content
-                root.right = __remove__(root.right, temp.content)
-            else:
-                if not root.content.less_than(value, key_parameter):
-                    root.left = __remove__(root.left, value)
-                else:
-                    root.right = __remove__(root.right, value)
+            # Move min up and delete min down the road
+            temp = self.__get_min__(node.right)
+            node.content = temp.content
+            value = temp.content
+            path.append((node, True))
+            node = node.right
 
-            self.__update_height__(root)
+        self.__length__ -= 1
+        self.__link_and_rebalance__(path, replacement, self.__rebalance_after_removal__)
 
-            # Rebalancing
-            balance = self.__get_balance__(root)
-
-            if balance > 1:
-                if self.__get_balance__(root.left) >= 0:
-                    return self.__right_rotate__(root)
-                else:
-                    root.left = self.__left_rotate__(root.left)
-                    return self.__right_rotate__(root)
-            elif balance < -1:
-                if self.__get_balance__(root.right) <= 0:
-                    return self.__left_rotate__(root)
-                else:
-                    root.right = self.__right_rotate__(root.right)
-                    return self.__left_rotate__(root)
+    def __rebalance_after_removal__(self, root: BBTNode) -> BBTNode:
+        self.__update_height__(root)
 
-            return root
+        balance = self.__get_balance__(root)
 
-        if found_item:
-            self.__length__ -= 1
+        if balance > 1:
+            if self.__get_balance__(root.left) >= 0:
+                return self.__right_rotate__(root)
+            else:
+                root.left = self.__left_rotate__(root.left)
+                return self.__right_rotate__(root)
+        elif balance < -1:
+            if self.__get_balance__(root.right) <= 0:
+                return self.__left_rotate__(root)
+            else:
+                root.right = self.__right_rotate__(root.right)
+                return self.__left_rotate__(root)
 
-        self.root = __remove__(self.root, item)
+        return root
 
     def __len__(self) -> int:
         return self.__length__
 
     def __iter__(self):
-        def __list__(root):
-            if root is None:
-                return
+        stack = []
+        node = self.root
+        while stack or node is not None:
+            while node is not None:
+                stack.append(node)
+                node = node.left
 
-            yield from __list__(root.left)
-            yield root.content
-            yield from __list__(root.right)
-
-        yield from __list__(self.root)
+            node = stack.pop()
+            yield node.content
+            node = node.right
 
     def find(self, item: SortableObject, key_parameter: object) -> Optional[SortableObject]:
         """
@@ -463,22 +490,13 @@ class ParameterizedBalancedBinarySearchTree:
         :rtype: Optional[SortableObject]
         """
 
-        def __find__(root):
-
-            if root is None:
-                return None
+        node = self.root
+        while node is not None and not node.content == item:
+            node = node.right if node.content.less_than(item, key_parameter) else node.left
 
-            if root.content == item:
-                return root
-            elif root.content.less_than(item, key_parameter):
-                return __find__(root.right)
-            else:
-                return __find__(root.left)
+        return None if node is None else node.content
 
-        found_item = __find__(self.root)
-        return None if found_item is None else found_item.content
-
-    def get_range(self, start_key: numeric, end_key: numeric, key_parameter: object) -> Iterable[SortableObject]:
+    def get_range(self, start_key: numeric, end_key: numeric, key_parameter: object) -> List[SortableObject]:
         """
             Returns all items in the range of [start_key, end_key] (including elements on the bounds)
         :param start_key: Start key
@@ -491,37 +509,42 @@ class ParameterizedBalancedBinarySearchTree:
         :rtype: List[SortableObject]
         """
 
+        # The precision is fixed for the whole query, so __greater_than__ is inlined in this hot check
+        precision = _get_precision()
+
         def _range_overlaps(current_start, current_end) -> bool:
-            if __greater_than__(current_start, current_end):
+            if current_start > current_end and not math.isclose(current_start, current_end, abs_tol=precision):
                 return False
-            return (not __greater_than__(start_key, current_end) and
-                    not __greater_than__(current_start, end_key))
-
-        def __get_range__(root: BBTNode, current_start, current_end) -> Iterable[SortableObject]:
-            if root is None:
-                return
-
-            root_key = root.content.get_key(key_parameter)
+            return (not (start_key > current_end and not math.isclose(start_key, current_end, abs_tol=precision))
+                    and not (current_start > end_key and not math.isclose(current_start, end_key,
+                                                                           abs_tol=precision)))
+
+        # In-order traversal with an explicit stack, only descending into subtrees whose key range overlaps the query
+        matches = []
+        stack = []
+        node, current_start, current_end = self.root, start_key, end_key
+        while stack or node is not None:
+            while node is not None:
+                root_key = node.content.get_key(key_parameter)
+                stack.append((node, root_key, current_start, current_end))
 
-            if root.left is not None:
-                new_start = current_start
                 new_end = min(current_end, root_key)
+                if node.left is not None and _range_overlaps(current_start, new_end):
+                    node, current_end = node.left, new_end
+                else:
+                    node = None
 
-                if _range_overlaps(new_start, new_end):
-                    yield from __get_range__(root.left, new_start, new_end)
+            root, root_key, current_start, current_end = stack.pop()
 
             if (not root.content.less_than_key(start_key, key_parameter)
                     and not root.content.greater_than_key(end_key, key_parameter)):
-                yield root.content
+                matches.append(root.content)
 
-            if root.right is not None:
-                new_start = max(current_start, root_key)
-                new_end = current_end
+            new_start = max(current_start, root_key)
+            if root.right is not None and _range_overlaps(new_start, current_end):
+                node, current_start = root.right, new_start
 
-                if _range_overlaps(new_start, new_end):
-                    yield from __get_range__(root.right, new_start, new_end)
-
-        yield from __get_range__(self.root, start_key, end_key)
+        return matches
 
     def empty(self):
         """
@@ -537,13 +560,20 @@ class ParameterizedBalancedBinarySearchTree:
         :return: The minimal item present in the tree. None if the tree is empty.
         :rtype: Optional[SortableObject]
         """
-        min_element = self.get_min()
-        if min_element is None:
+        if self.root is None:
             return None
 
-        self.remove(min_element, None)
+        # Descend to the leftmost node once and unlink it directly instead of searching for it again
+        path = []
+        node = self.root
+        while node.left is not None:
+            path.append((node, False))
+            node = node.left
+
+        self.__length__ -= 1
+        self.__link_and_rebalance__(path, node.right, self.__rebalance_after_removal__)
 
-        return min_element
+        return node.content
 
 
 # endregion
@@ -571,6 +601,20 @@ class SweepLineEdgeInfo(SortableObject):
             self.start_position = position_b
             self.end_position = position_a
 
+        # The line through the edge is evaluated at every comparison in the sweep line status, so its parameters are
+        # computed once. The last evaluated x-coordinate is kept, as one tree operation compares the same edges at the
+        # same height over and over again.
+        x1, y1 = self.start_position
+        x2, y2 = self.end_position
+        # Float copies of the endpoints for the segment tests, which would otherwise convert them on every call
+        self.start_point = (float(x1), float(y1))
+        self.end_point = (float(x2), float(y2))
+        self._is_vertical = x2 == x1
+        self._slope = None if self._is_vertical or y2 - y1 == 0 else (y2 - y1) / (x2 - x1)
+        self._intercept = None if self._slope is None else y1 - self._slope * x1
+        self._last_y = None
+        self._last_x = None
+
     # region Implementation of SortableObject
 
     def less_than(self, other, key_parameter: numeric):
@@ -732,18 +776,16 @@ class EventQueue:
 
 
 def __get_x_at_y__(edge_info: SweepLineEdgeInfo, y: numeric):
-    x1, y1 = edge_info.start_position
-    x2, y2 = edge_info.end_position
-
-    if x2 == x1:
-        return x1
-    if y2 - y1 == 0:
+    if edge_info._is_vertical:
+        return edge_info.start_position[0]
+    if edge_info._slope is None:
         raise ValueError("Horizontal line, TODO")
-    m = (y2 - y1) / (x2 - x1)
-    b = y1 - m * x1
-    x = (y - b) / m
 
-    return x
+    if edge_info._last_y != y:
+        edge_info._last_x = (y - edge_info._intercept) / edge_info._slope
+        edge_info._last_y = y
+
+    return edge_info._last_x
 
 
 class SweepLineStatus:
@@ -795,7 +837,7 @@ class SweepLineStatus:
         """
         return self.sortedList.get_right(point.x, point.y)
 
-    def get_range(self, y: numeric, left_x: numeric, right_x: numeric) -> Iterable[SweepLineEdgeInfo]:
+    def get_range(self, y: numeric, left_x: numeric, right_x: numeric) -> List[SweepLineEdgeInfo]:
         """
             Returns all matching edges in range [left_x, right_x]
         :param y:
@@ -47,12 +47,13 @@
 """
 import math
 import sys
+from fractions import Fraction
 from typing import List, Optional, Tuple, Union
 
 import networkx as nx
-from shapely.geometry import LineString
+import numpy as np
 
-from gdMetriX import crossingDataTypes, common, edge_directions, boundary, distribution
+from gdMetriX import crossingDataTypes, common, edge_directions, boundary
 from gdMetriX.crossingDataTypes import EventQueue, SweepLineEdgeInfo, SweepLineStatus, CrossingPoint, CrossingLine, \
     Crossing
 
@@ -62,46 +63,204 @@ def __share_endpoint__(line_a: SweepLineEdgeInfo, line_b: SweepLineEdgeInfo):
             or line_a.edge[1] == line_b.edge[1])
 
 
+# Relative error bound of the floating point orientation determinant (Shewchuk's ccwerrboundA)
+__ORIENTATION_ERROR_BOUND = 3.3306690738754716e-16
+
+
+def __orientation__(p: Tuple[float, float], q: Tuple[float, float], r: Tuple[float, float]) -> int:
+    # Sign of the cross product (q - p) x (r - p). Only when the floating point result is too close to zero to be
+    # trusted, it is recomputed exactly.
+    left = (q[0] - p[0]) * (r[1] - p[1])
+    right = (q[1] - p[1]) * (r[0] - p[0])
+    det = left - right
+
+    bound = __ORIENTATION_ERROR_BOUND * (abs(left) + abs(right))
+    if det > bound:
+        return 1
+    if det < -bound:
+        return -1
+
+    p_x, p_y = Fraction(p[0]), Fraction(p[1])
+    exact = (Fraction(q[0]) - p_x) * (Fraction(r[1]) - p_y) - (Fraction(q[1]) - p_y) * (Fraction(r[0]) - p_x)
+    return (exact > 0) - (exact < 0)
+
+
+def __segment_intersection__(a: Tuple[float, float], b: Tuple[float, float], c: Tuple[float, float],
+                             d: Tuple[float, float]) -> Union[CrossingPoint, CrossingLine, None]:
+    # Exact intersection of the segments ab and cd. Overlaps are reported in the direction of ab, and degenerate
+    # segments never intersect.
+    #
+    # Edges of a drawing are rarely collinear or touching, so the four orientations are first evaluated in floating
+    # point. Only if one of them is too close to zero to be trusted, the general routine takes over.
+    ab_x, ab_y = b[0] - a[0], b[1] - a[1]
+    left, right = ab_x * (c[1] - a[1]), ab_y * (c[0] - a[0])
+    det_c, bound_c = left - right, __ORIENTATION_ERROR_BOUND * (abs(left) + abs(right))
+    left, right = ab_x * (d[1] - a[1]), ab_y * (d[0] - a[0])
+    det_d, bound_d = left - right, __ORIENTATION_ERROR_BOUND * (abs(left) + abs(right))
+
+    if abs(det_c) > bound_c and abs(det_d) > bound_d:
+        if (det_c > 0) == (det_d > 0):
+            return None
+
+        cd_x, cd_y = d[0] - c[0], d[1] - c[1]
+        left, right = cd_x * (a[1] - c[1]), cd_y * (a[0] - c[0])
+        det_a, bound_a = left - right, __ORIENTATION_ERROR_BOUND * (abs(left) + abs(right))
+        left, right = cd_x * (b[1] - c[1]), cd_y * (b[0] - c[0])
+        det_b, bound_b = left - right, __ORIENTATION_ERROR_BOUND * (abs(left) + abs(right))
+
+        if abs(det_a) > bound_a and abs(det_b) > bound_b:
+            if (det_a > 0) == (det_b > 0):
+                return None
+
+            t = det_a / (det_a - det_b)
+            return CrossingPoint(a[0] + t * ab_x, a[1] + t * ab_y)
+
+    return __segment_intersection_exact__(a, b, c, d)
+
+
+def __segment_intersection_exact__(a: Tuple[float, float], b: Tuple[float, float], c: Tuple[float, float],
+                                   d: Tuple[float, float]) -> Union[CrossingPoint, CrossingLine, None]:
+    # General case of __segment_intersection__, which decides every orientation exactly
+    if a == b or c == d:
+        return None
+
+    orientation_c = __orientation__(a, b, c)
+    orientation_d = __orientation__(a, b, d)
+
+    if orientation_c == 0 and orientation_d == 0:
+        # Collinear: the overlap runs from the later of the two starts to the earlier of the two ends along ab
+        direction = (b[0] - a[0], b[1] - a[1])
+
+        def _along(point):
+            return (point[0] - a[0]) * direction[0] + (point[1] - a[1]) * direction[1]
+
+        first, second = (c, d) if _along(c) <= _along(d) else (d, c)
+        start = first if _along(first) > 0 else a
+        end = second if _along(second) < _along(b) else b
+
+        if _along(start) > _along(end):
+            return None
+        if start == end:
+            return CrossingPoint(start[0], start[1])
+        return CrossingLine(start, end)
+
+    if orientation_c * orientation_d > 0:
+        return None
+
+    orientation_a = __orientation__(c, d, a)
+    orientation_b = __orientation__(c, d, b)
+
+    if orientation_a * orientation_b > 0:
+        return None
+
+    # Touching endpoints are returned as they are
+    for orientation, point in ((orientation_c, c), (orientation_d, d), (orientation_a, a), (orientation_b, b)):
+        if orientation == 0:
+            return CrossingPoint(point[0], point[1])
+
+    det_a = (d[0] - c[0]) * (a[1] - c[1]) - (d[1] - c[1]) * (a[0] - c[0])
+    det_b = (d[0] - c[0]) * (b[1] - c[1]) - (d[1] - c[1]) * (b[0] - c[0])
+    # The exact orientations guarantee a proper crossing, so rounding may only push t slightly out of [0, 1]
+    t = min(max(det_a / (det_a - det_b), 0.0), 1.0) if det_a != det_b else 0.5
+    return CrossingPoint(a[0] + t * (b[0] - a[0]), a[1] + t * (b[1] - a[1]))
+
+
+def __beyond_segment_line__(a: Tuple[float, float], b: Tuple[float, float], p: Tuple[float, float],
+                            q: Tuple[float, float], margin: float) -> bool:
+    # Scalar counterpart of __beyond_line__ for a single pair of segments
+    d_x, d_y = b[0] - a[0], b[1] - a[1]
+    threshold = margin * math.hypot(d_x, d_y)
+
+    left_p, right_p = d_x * (p[1] - a[1]), d_y * (p[0] - a[0])
+    left_q, right_q = d_x * (q[1] - a[1]), d_y * (q[0] - a[0])
+    bound_p = threshold + 1e-12 * (abs(left_p) + abs(right_p) + threshold)
+    bound_q = threshold + 1e-12 * (abs(left_q) + abs(right_q) + threshold)
+    det_p, det_q = left_p - right_p, left_q - right_q
+
+    return (det_p > bound_p and det_q > bound_q) or (det_p < -bound_p and det_q < -bound_q)
+
+
+def __distance_to_segment__(a: Tuple[float, float], b: Tuple[float, float], p: Tuple[float, float]) -> float:
+    # Distance of p to the segment ab, i.e. to its closest point - which might be an endpoint
+    d_x, d_y = b[0] - a[0], b[1] - a[1]
+
+    if (d_x == 0 and d_y == 0) or d_x * (p[0] - b[0]) + d_y * (p[1] - b[1]) > 0:
+        # Point is closer to endpoint b
+        return math.hypot(p[0] - b[0], p[1] - b[1])
+    if d_x * (p[0] - a[0]) + d_y * (p[1] - a[1]) < 0:
+        # Point is closer to endpoint a
+        return math.hypot(p[0] - a[0], p[1] - a[1])
+    return abs(d_x * (a[1] - p[1]) - d_y * (a[0] - p[0])) / math.hypot(d_x, d_y)
+
+
 def __check_lines__(line_a: SweepLineEdgeInfo, line_b: SweepLineEdgeInfo) -> Union[CrossingPoint, CrossingLine, None]:
-    # Replace with custom implementation without shapely in the future
     if line_a is not None and line_b is not None:
-        line1 = LineString((line_a.start_position, line_a.end_position))
-        line2 = LineString((line_b.start_position, line_b.end_position))
+        a, b = line_a.start_point, line_a.end_point
+        c, d = line_b.start_point, line_b.end_point
+        precision = crossingDataTypes._get_precision()
 
-        crossing_point = line1.intersection(line2)
+        # Edges whose bounding boxes are further apart than the precision can neither cross nor touch
+        if (max(a[0], b[0]) < min(c[0], d[0]) - precision or max(c[0], d[0]) < min(a[0], b[0]) - precision or
+                max(a[1], b[1]) < min(c[1], d[1]) - precision or max(c[1], d[1]) < min(a[1], b[1]) - precision):
+            return None
 
-        if not crossing_point.is_empty:
-            if isinstance(crossing_point, LineString):
-                return CrossingLine((crossing_point.coords[0][0], crossing_point.coords[0][1]),
-                                    (crossing_point.coords[1][0], crossing_point.coords[1][1]))
+        crossing_point = __segment_intersection__(a, b, c, d)
+
+        if crossing_point is not None:
+            if isinstance(crossing_point, CrossingLine):
+                return crossing_point
             elif not __share_endpoint__(line_a, line_b):
-                return CrossingPoint(crossing_point.x, crossing_point.y)
-        else:
-            # Check if an endpoint lies on another edge
-            distance_a_sta = distribution._get_distance_between_edge_and_node(line_b.start_position,
-                                                                              line_b.end_position,
-                                                                              line_a.start_position)
-            distance_a_end = distribution._get_distance_between_edge_and_node(line_b.start_position,
-                                                                              line_b.end_position,
-                                                                              line_a.end_position)
-            distance_b_sta = distribution._get_distance_between_edge_and_node(line_a.start_position,
-                                                                              line_a.end_position,
-                                                                              line_b.start_position)
-            distance_b_end = distribution._get_distance_between_edge_and_node(line_a.start_position,
-                                                                              line_a.end_position,
-                                                                              line_b.end_position)
-            if crossingDataTypes.__numeric_eq__(distance_a_sta, 0.0):
+                return crossing_point
+        elif not (__beyond_segment_line__(a, b, c, d, precision) or __beyond_segment_line__(c, d, a, b, precision)):
+            # Check if an endpoint lies on another edge - unless one edge lies clearly on one side of the other
+            if crossingDataTypes.__numeric_eq__(__distance_to_segment__(c, d, a), 0.0):
                 return CrossingPoint(line_a.start_position[0], line_a.start_position[1])
-            if crossingDataTypes.__numeric_eq__(distance_a_end, 0.0):
+            if crossingDataTypes.__numeric_eq__(__distance_to_segment__(c, d, b), 0.0):
                 return CrossingPoint(line_a.end_position[0], line_a.end_position[1])
-            if crossingDataTypes.__numeric_eq__(distance_b_sta, 0.0):
+            if crossingDataTypes.__numeric_eq__(__distance_to_segment__(a, b, c), 0.0):
                 return CrossingPoint(line_b.start_position[0], line_b.start_position[1])
-            if crossingDataTypes.__numeric_eq__(distance_b_end, 0.0):
+            if crossingDataTypes.__numeric_eq__(__distance_to_segment__(a, b, d), 0.0):
                 return CrossingPoint(line_b.end_position[0], line_b.end_position[1])
 
     return None
 
 
+def __edge_coordinates__(edge_infos: List[SweepLineEdgeInfo]) -> np.ndarray:
+    # One row (start x, start y, end x, end y) per edge
+    return np.array([(info.start_position[0], info.start_position[1], info.end_position[0],
+                      info.end_position[1]) for info in edge_infos], dtype=float).reshape(-1, 4)
+
+
+def __bounding_boxes__(coordinates: np.ndarray, margin: float) \
+        -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+    x_min = np.minimum(coordinates[:, 0], coordinates[:, 2]) - margin
+    y_min = np.minimum(coordinates[:, 1], coordinates[:, 3]) - margin
+    x_max = np.maximum(coordinates[:, 0], coordinates[:, 2]) + margin
+    y_max = np.maximum(coordinates[:, 1], coordinates[:, 3]) + margin
+
+    return x_min, y_min, x_max, y_max
+
+
+def __beyond_line__(line: np.ndarray, a_x, a_y, b_x, b_y, margin: float) -> np.ndarray:
+    # True wherever both points lie strictly on the same side of the line through the segment, further away from it
+    # than the margin. The floating point error of the determinants is accounted for, so this never excludes points
+    # that touch the line or lie within the margin.
+    d_x = line[..., 2] - line[..., 0]
+    d_y = line[..., 3] - line[..., 1]
+    threshold = margin * np.hypot(d_x, d_y)
+
+    def _side(p_x, p_y):
+        left = d_x * (p_y - line[..., 1])
+        right = d_y * (p_x - line[..., 0])
+        bound = threshold + 1e-12 * (np.abs(left) + np.abs(right) + threshold)
+        det = left - right
+        return det > bound, det < -bound
+
+    a_left, a_right = _side(a_x, a_y)
+    b_left, b_right = _side(b_x, b_y)
+    return (a_left & b_left) | (a_right & b_right)
+
+
 def get_crossings_quadratic(g: nx.Graph, pos: Union[str, dict, None] = None, include_node_crossings: bool = False,
                             precision: float = 1e-09) -> List[Crossing]:
     r"""
@@ -133,19 +292,32 @@ def get_crossings_quadratic(g: nx.Graph, pos: Union[str, dict, None] = None, inc
     pos = common.get_node_positions(g, pos)
     crossings = []
 
-    for edge1 in g.edges():
-        for edge2 in g.edges():
+    edges = list(g.edges())
+    edge_infos = [crossingDataTypes.SweepLineEdgeInfo(edge, pos[edge[0]], pos[edge[1]]) for edge in edges]
+    coordinates = __edge_coordinates__(edge_infos)
+    x_min, y_min, x_max, y_max = __bounding_boxes__(coordinates, precision)
+
+    for i, edge1 in enumerate(edges):
+        # Two edges can only touch if their bounding boxes (widened by the precision) overlap
+        candidates = np.flatnonzero((x_min <= x_max[i]) & (x_max >= x_min[i]) & (y_min <= y_max[i]) &
+                                    (y_max >= y_min[i]))
+
+        # ... and if neither lies completely on one side of the line through the other
+        own, others = coordinates[i], coordinates[candidates]
+        separated = (__beyond_line__(own, others[:, 0], others[:, 1], others[:, 2], others[:, 3], precision) |
+                     __beyond_line__(others, own[0], own[1], own[2], own[3], precision))
+        candidates = candidates[~separated]
+
+        for j in candidates.tolist():
+            edge2 = edges[j]
 
             if edge1 == edge2:
                 continue
 
-            crossing_point = __check_lines__(
-                crossingDataTypes.SweepLineEdgeInfo(edge1, pos[edge1[0]], pos[edge1[1]]),
-                crossingDataTypes.SweepLineEdgeInfo(edge2, pos[edge2[0]], pos[edge2[1]])
-            )
+            crossing_point = __check_lines__(edge_infos[i], edge_infos[j])
 
             if crossing_point is not None:
-                crossings.append(Crossing(crossing_point, {edge1, edge2}))
+                crossings.append(Crossing(crossing_point, {edge1, edge2}, [edge_infos[i], edge_infos[j]]))
 
     crossings.sort()
 
@@ -157,6 +329,7 @@ def get_crossings_quadratic(g: nx.Graph, pos: Union[str, dict, None] = None, inc
         crossing = crossings[i]
         if previous_crossing is not None and crossingDataTypes.__points_equal__(previous_crossing.pos, crossing.pos):
             previous_crossing.involved_edges.update(crossing.involved_edges)
+            previous_crossing.edge_infos.update(crossing.edge_infos)
             crossings.pop(i)
         else:
             i += 1
@@ -183,6 +356,12 @@ def __build_event_queue__(g, node_positions):
 
 
 def __filter_crossing_edges(cr: Crossing, pos, include_node_crossings) -> set:
+    # Reuse the sweep line representations attached to the crossing and only build those that are missing
+    edge_infos = {}
+    for edge in cr.involved_edges:
+        info = cr.edge_infos.get(edge)
+        edge_infos[edge] = info if info is not None else SweepLineEdgeInfo(edge, pos[edge[0]], pos[edge[1]])
+
     if include_node_crossings:
         edges = cr.involved_edges
 
@@ -203,9 +382,9 @@ def __filter_crossing_edges(cr: Crossing, pos, include_node_crossings) -> set:
     else:
         # Only add those edges which actually cross and not those just ending in that point
         edges = []
-        for edge in cr.involved_edges:
-            if not (crossingDataTypes.__points_equal__(pos[edge[0]], cr.pos)
-                    or crossingDataTypes.__points_equal__(pos[edge[1]], cr.pos)):
+        for edge, info in edge_infos.items():
+            if not (crossingDataTypes.__points_equal__(info.start_position, cr.pos)
+                    or crossingDataTypes.__points_equal__(info.end_position, cr.pos)):
                 edges.append(edge)
 
         edges = set(edges)
@@ -216,11 +395,9 @@ def __filter_crossing_edges(cr: Crossing, pos, include_node_crossings) -> set:
     # It might be the case that we have removed all actual crossings and what remain are just crossing lines
     just_lines = True
     edge_list = list(edges)
+    first_edge = edge_infos[edge_list[0]]
     for index in range(1, len(edge_list)):
-        if type(__check_lines__(
-                SweepLineEdgeInfo(edge_list[0], pos[edge_list[0][0]], pos[edge_list[0][1]]),
-                SweepLineEdgeInfo(edge_list[index], pos[edge_list[index][0]], pos[edge_list[index][1]])
-        )) != CrossingLine:
+        if type(__check_lines__(first_edge, edge_infos[edge_list[index]])) != CrossingLine:
             just_lines = False
             break
 
@@ -280,6 +457,7 @@ def get_crossings(g: nx.Graph, pos: Union[str, dict, None] = None, include_node_
         for index, existing_crossing in enumerate(crossings):
             if crossingDataTypes.__points_equal__(existing_crossing.pos, cr.pos):
                 existing_crossing.involved_edges |= cr.involved_edges
+                existing_crossing.edge_infos.update(cr.edge_infos)
                 return
 
             if crossingDataTypes._less_than(existing_crossing.pos, cr.pos):
@@ -324,7 +502,7 @@ def get_crossings(g: nx.Graph, pos: Union[str, dict, None] = None, include_node_
 
             elif edge_a.is_horizontal() or edge_b.is_horizontal():
                 __insert_crossing_into_crossing_list__(Crossing(CrossingPoint(cr.x, cr.y),
-                                                                {edge_a.edge, edge_b.edge}))
+                                                                {edge_a.edge, edge_b.edge}, [edge_a, edge_b]))
             else:
                 # In case the crossing came before, we assume it is already discovered
                 pass
@@ -393,7 +571,7 @@ def get_crossings(g: nx.Graph, pos: Union[str, dict, None] = None, include_node_
                 involved_edges |= current_event_point.start_list | current_event_point.end_list
 
             crossing = Crossing(CrossingPoint(current_event_point.x, current_event_point.y),
-                                set([edge.edge for edge in involved_edges]))
+                                set([edge.edge for edge in involved_edges]), involved_edges)
 
             __insert_crossing_into_crossing_list__(crossing)
 
@@ -485,14 +663,15 @@ def get_crossings(g: nx.Graph, pos: Union[str, dict, None] = None, include_node_
         # In order to report all crossings in order, we report it only after encountering it on the sweepline
         if current_event_point.is_crossing or len(edges_discovered_at_current_event_point) != 0:
             if include_node_crossings:
-                relevant_edges = set([edge.edge for edge in
-                                      current_event_point.start_list | current_event_point.end_list
-                                      | current_event_point.interior_list | current_event_point.horizontal_list
-                                      | set(edges_discovered_at_current_event_point)])
+                relevant_edge_infos = (current_event_point.start_list | current_event_point.end_list
+                                       | current_event_point.interior_list | current_event_point.horizontal_list
+                                       | set(edges_discovered_at_current_event_point))
             else:
-                relevant_edges = set([edge.edge for edge in current_event_point.interior_list])
+                relevant_edge_infos = current_event_point.interior_list
+            relevant_edges = set([edge.edge for edge in relevant_edge_infos])
 
-            new_crossing = Crossing(CrossingPoint(current_event_point.x, current_event_point.y), relevant_edges)
+            new_crossing = Crossing(CrossingPoint(current_event_point.x, current_event_point.y), relevant_edges,
+                                    relevant_edge_infos)
             __insert_crossing_into_crossing_list__(new_crossing)
         else:
             pass
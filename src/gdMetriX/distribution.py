@@ -413,31 +413,23 @@ def _closest_pair_recursion(x_sorted, y_sorted):
         return p_split, q_split, min_split
 
 
-def _edge_node_distance(edge: Tuple[object, object], node: object, pos) -> float:
-    return _get_distance_between_edge_and_node(pos[edge[0]], pos[edge[1]], pos[node])
+def _get_distances_between_edge_and_nodes(edge_pos_a, edge_pos_b, node_positions: np.ndarray) -> np.ndarray:
+    # Distances of all node positions to the edge segment, i.e. to its closest point - which might be an endpoint
+    a_pos, b_pos = np.asarray(edge_pos_a, dtype=float), np.asarray(edge_pos_b, dtype=float)
 
+    v_ab = b_pos - a_pos
+    v_bn = node_positions - b_pos
+    v_an = node_positions - a_pos
+    length = np.linalg.norm(v_ab)
 
-def _get_distance_between_edge_and_node(edge_pos_a, edge_pos_b, node_pos) -> float:
-    def _distance(point_a, point_b):
-        return np.linalg.norm(point_a - point_b)
+    distance_to_b = np.sqrt(np.sum(v_bn * v_bn, axis=1))
+    if length == 0:
+        return distance_to_b
 
-    a_pos, b_pos = np.asarray(edge_pos_a), np.asarray(edge_pos_b)
-    n_pos = np.asarray(node_pos)
+    distance_to_a = np.sqrt(np.sum(v_an * v_an, axis=1))
+    distance_to_line = np.abs(v_ab[0] * v_an[:, 1] - v_ab[1] * v_an[:, 0]) / length
 
-    v_ab = b_pos - a_pos
-    v_bn = n_pos - b_pos
-    v_an = n_pos - a_pos
-    v_na = a_pos - n_pos
-
-    if np.linalg.norm(v_ab) == 0 or np.dot(v_ab, v_bn) > 0:
-        # Node is closer to endpoint b
-        return _distance(n_pos, b_pos)
-    elif np.dot(v_ab, v_an) < 0:
-        # Node is closer to endpoint a
-        return _distance(n_pos, a_pos)
-    else:
-        # Node is closer to edge itself -> return distance to line
-        return np.abs(np.cross(v_ab, v_na) / np.linalg.norm(v_ab))
+    return np.where(v_bn @ v_ab > 0, distance_to_b, np.where(v_an @ v_ab < 0, distance_to_a, distance_to_line))
 
 
 def closest_pair_of_elements(g: nx.Graph, pos: Union[str, dict, None] = None, consider_crossings=False):
@@ -464,15 +456,18 @@ def closest_pair_of_elements(g: nx.Graph, pos: Union[str, dict, None] = None, co
             first_crossing = crossing_list[0]
             return first_crossing.involved_edges[0], first_crossing.involved_edges[1], 0.0
 
-    for edge in g.edges():
-        for node in g.nodes():
-            if edge[0] == node or edge[1] == node:
-                continue
+    nodes = list(g.nodes())
+    node_index = {node: i for i, node in enumerate(nodes)}
+    node_positions = np.array([pos[node] for node in nodes], dtype=float).reshape(-1, 2)
 
-            distance = _edge_node_distance(edge, node, pos)
+    for edge in g.edges():
+        # Distances of all nodes to the edge at once, ignoring the endpoints of the edge itself
+        distances = _get_distances_between_edge_and_nodes(pos[edge[0]], pos[edge[1]], node_positions)
+        distances[[node_index[edge[0]], node_index[edge[1]]]] = np.inf
 
-            if distance < min_distance:
-                element_a, element_b, min_distance = node, edge, distance
+        closest = int(np.argmin(distances))
+        if distances[closest] < min_distance:
+            element_a, element_b, min_distance = nodes[closest], edge, float(distances[closest])
 
     return element_a, element_b, min_distance
 
@@ -559,33 +554,43 @@ def gabriel_ratio(g: nx.Graph, pos: Union[str, dict, None] = None) -> float:
     return 1 - (violations / max_estimate)
 
 
-def _smallest_enclosing_circle_recursion(points: List[common.Vector], boundary: List[common.Vector]) -> common.Circle:
-    # TODO iterative approach would be preverable as there is a build in depth limit limiting the maximum number of
-    #  processable points
-    if len(points) == 0 or len(boundary) == 3:
-        if len(boundary) == 0:
-            return common.Vector(0, 0), 0
-        elif len(boundary) == 1:
-            return boundary[0], 0
-        elif len(boundary) == 2:
-            return common.circle_from_two_points(boundary[0], boundary[1])
-        else:
-            return common.circle_from_three_points(boundary[0], boundary[1], boundary[2])
+def _circle_from_boundary(a: common.Vector, b: common.Vector, c: common.Vector) -> common.Circle:
+    circle = common.circle_from_three_points(a, b, c)
+    if circle is not None:
+        return circle
+
+    # Collinear points, so the two outermost ones define the circle
+    return max((common.circle_from_two_points(a, b), common.circle_from_two_points(a, c),
+                common.circle_from_two_points(b, c)), key=lambda candidate: candidate[1])
+
+
+def _smallest_enclosing_circle_iterative(points: List[common.Vector]) -> common.Circle:
+    # Welzl's algorithm without recursion: Whenever a point lies outside the circle of the points before it, the circle
+    # is rebuilt from those points with the new point on its boundary, and then again with a second boundary point.
+    # Unlike the recursive formulation, this is not bound by the recursion limit.
 
-    point = points.pop()
-    center, radius = _smallest_enclosing_circle_recursion(points, boundary)
+    def _is_outside(point, center, radius) -> bool:
+        # Points on the boundary may end up an ulp outside the computed circle, which must not count as outside
+        return math.sqrt((point.x - center.x) ** 2 + (point.y - center.y) ** 2) > radius * (1 + 1e-12)
+
+    center, radius = points[0], 0
+    for i in range(1, len(points)):
+        p = points[i]
+        if not _is_outside(p, center, radius):
+            continue
+
+        center, radius = p, 0
+        for j in range(i):
+            q = points[j]
+            if not _is_outside(q, center, radius):
+                continue
 
-    # Still valid, just pass it on
-    if point.distance(center) <= radius:
-        points.append(point)
-        return center, radius
+            center, radius = common.circle_from_two_points(p, q)
+            for k in range(j):
+                if _is_outside(points[k], center, radius):
+                    center, radius = _circle_from_boundary(p, q, points[k])
 
-    # We need to find a new solution with p on the boundary
-    boundary.append(point)
-    circle = _smallest_enclosing_circle_recursion(points, boundary)
-    boundary.pop()
-    points.append(point)
-    return circle
+    return center, radius
 
 
 def smallest_enclosing_circle_from_point_set(points: Iterable) -> common.Circle:
@@ -597,7 +602,9 @@ def smallest_enclosing_circle_from_point_set(points: Iterable) -> common.Circle:
     :return: The centre and radius of the smallest circle containing all points in the list.
     :rtype:  gdMetriX.Circle
     """
-    points = [common.Vector(p[0], p[1]) for p in points]
+    # Coincident points are only considered once, as duplicates of a boundary point would otherwise break the
+    # assumption that a point outside the current circle has to lie on the boundary of the next one
+    points = [common.Vector(x, y) for x, y in dict.fromkeys((p[0], p[1]) for p in points)]
 
     if len(points) == 0:
         return Vector(0,0), 0
@@ -635,7 +642,7 @@ def smallest_enclosing_circle_from_point_set(points: Iterable) -> common.Circle:
     for point in elements:
         points.insert(0, point)
 
-    return _smallest_enclosing_circle_recursion(points, [])
+    return _smallest_enclosing_circle_iterative(points)
 
 
 def smallest_enclosing_circle(g: nx.Graph, pos: Union[str, dict, None] = None) -> common.Circle:
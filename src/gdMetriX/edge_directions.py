@@ -24,13 +24,42 @@ Methods
 """
 
 import math
+import os
+from concurrent.futures import ProcessPoolExecutor
 from typing import Union, Tuple, Optional, List
 
 import networkx as nx
 import numpy as np
 
 from gdMetriX import common
-from gdMetriX.common import numeric, Vector, Angle
+from gdMetriX.common import numeric
+
+
+def _positions(g: nx.Graph, pos: Union[str, dict, None]) -> Tuple[np.ndarray, dict]:
+    """
+    Returns the node positions as a (n, 2) array together with a dictionary mapping each node to its row.
+    """
+    pos = common.get_node_positions(g, pos)
+    node_to_index = {node: i for i, node in enumerate(pos)}
+    pos_array = np.fromiter((c for p in pos.values() for c in p), dtype=float, count=2 * len(pos))
+    return pos_array.reshape(-1, 2), node_to_index
+
+
+def _edge_indices(g: nx.Graph, node_to_index: dict) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Returns the row indices of the start and end node of each edge, in the order of g.edges().
+    """
+    indices = np.fromiter(map(node_to_index.__getitem__, (node for edge in g.edges() for node in edge)),
+                          dtype=np.intp, count=2 * g.number_of_edges())
+    return indices[0::2], indices[1::2]
+
+
+def _edge_vectors(g: nx.Graph, pos_array: np.ndarray, node_to_index: dict) -> np.ndarray:
+    """
+    Returns the vectors pointing from the start to the end of each edge as a (m, 2) array, in the order of g.edges().
+    """
+    start, end = _edge_indices(g, node_to_index)
+    return pos_array[end] - pos_array[start]
 
 
 def upwards_flow(g: nx.DiGraph, pos: Union[str, dict, None] = None,
@@ -51,24 +80,19 @@ def upwards_flow(g: nx.DiGraph, pos: Union[str, dict, None] = None,
     :return: Percentage of edges pointing 'upwards'
     :rtype: Optional[float]
     """
-    if g is None or not nx.is_directed(g) or len(g.edges()) == 0:
+    if g is None or not nx.is_directed(g) or g.number_of_edges() == 0:
         return 0
 
     if direction_vector == (0, 0):
         return None
 
-    pos = common.get_node_positions(g, pos)
-
-    sum_upward_edges = 0
-
-    for edge in g.edges():
-        e_vector = np.subtract(pos[edge[1]], pos[edge[0]])
-        inner_product = np.inner(e_vector, direction_vector)
+    return _upwards_flow(_edge_vectors(g, *_positions(g, pos)), direction_vector)
 
-        if inner_product > 0:
-            sum_upward_edges += 1
 
-    return float(sum_upward_edges) / len(g.edges())
+def _upwards_flow(e_vectors: np.ndarray, direction_vector: Tuple[numeric, numeric]) -> float:
+    # Share of edge vectors with a positive inner product with the direction vector
+    inner_products = e_vectors @ np.asarray(direction_vector, dtype=float)
+    return np.count_nonzero(inner_products > 0) / len(e_vectors)
 
 
 def average_flow(g: nx.DiGraph, pos: Union[str, dict, None] = None) -> Optional[Tuple[float, float]]:
@@ -83,17 +107,17 @@ def average_flow(g: nx.DiGraph, pos: Union[str, dict, None] = None) -> Optional[
     :return: The average edge direction, as a normalized vector.
     :rtype: Optional[Tuple[float, float]]
     """
-    if g is None or not nx.is_directed(g) or len(g.edges()) == 0:
+    if g is None or not nx.is_directed(g) or g.number_of_edges() == 0:
         return None
 
-    pos = common.get_node_positions(g, pos)
-    sum_vector = np.array([0.0, 0.0])
+    return _average_flow(_edge_vectors(g, *_positions(g, pos)))
+
 
-    for edge in g.edges():
-        e_vector = np.subtract(pos[edge[1]], pos[edge[0]])
-        length = np.linalg.norm(e_vector)
-        if length != 0:
-            sum_vector += e_vector / length
+def _average_flow(e_vectors: np.ndarray) -> Tuple[float, float]:
+    # Normalized sum of the unit edge vectors, ignoring edges of length zero
+    lengths = np.linalg.norm(e_vectors, axis=1)
+    non_zero = lengths != 0
+    sum_vector = (e_vectors[non_zero] / lengths[non_zero, np.newaxis]).sum(axis=0)
 
     sum_length = np.linalg.norm(sum_vector)
     if sum_length != 0:
@@ -118,7 +142,16 @@ def coherence_to_average_flow(g: nx.DiGraph, pos: Union[str, dict, None] = None)
     :return: The coherence to the average flow
     :rtype: Optional[float]
     """
-    return upwards_flow(g, pos, average_flow(g, pos))
+    if g is None or not nx.is_directed(g) or g.number_of_edges() == 0:
+        return 0
+
+    e_vectors = _edge_vectors(g, *_positions(g, pos))
+
+    direction_vector = _average_flow(e_vectors)
+    if direction_vector == (0, 0):
+        return None
+
+    return _upwards_flow(e_vectors, direction_vector)
 
 
 def ordered_neighborhood(g: nx.Graph, node: object, pos: Union[str, dict, None] = None) -> List:
@@ -137,41 +170,85 @@ def ordered_neighborhood(g: nx.Graph, node: object, pos: Union[str, dict, None]
     """
     pos = common.get_node_positions(g, pos)
 
-    neighbors = [edge[0] if edge[0] != node else edge[1] for edge in g.edges(node)]
-    neighbors = list(filter(lambda nb: nb != node, neighbors))
-    return __order_clockwise__(neighbors, pos[node], pos)
+    return __order_clockwise__(_neighbors(g, node), pos[node], pos)
+
+
+def _neighbors(g: nx.Graph, node: object) -> List:
+    adjacency = g.adj[node]
+    # Only filter out self-loops if the node actually has one
+    has_self_loop = node in adjacency
+
+    if g.is_multigraph():
+        # Parallel edges each contribute their own entry to the neighborhood
+        if has_self_loop:
+            return [nb for nb, keys in adjacency.items() if nb != node for _ in keys]
+        return [nb for nb, keys in adjacency.items() for _ in keys]
+
+    if has_self_loop:
+        return [nb for nb in adjacency if nb != node]
+    return list(adjacency)
+
+
+_BATCHED_ORDER_THRESHOLD = 256
+
+
+def __clockwise_angle__(dx: float, dy: float) -> float:
+    # Clockwise angle from the positive y-axis, equal to Vector(0, 1).angle(Vector(dx, dy))
+    if dx == 0 and dy == 0:
+        return 0
+    angle = math.atan2(dx, dy)
+    return angle + 2 * math.pi if angle < 0 else angle
 
 
 def __order_clockwise__(nodes: List, origin: Tuple[numeric, numeric], pos: Union[str, dict, None]) -> List:
-    def __get_angle_between_nodes__(pos_a, pos_b) -> float:
-        vector = Vector.from_point(pos_b) - Vector.from_point(pos_a)
-        return Vector(0, 1).angle(vector)
+    if len(nodes) >= _BATCHED_ORDER_THRESHOLD:
+        return __order_clockwise_batched__(nodes, origin, pos)
+
+    origin_x, origin_y = origin[0], origin[1]
+    return sorted(nodes, key=lambda nb: __clockwise_angle__(pos[nb][0] - origin_x, pos[nb][1] - origin_y))
+
+
+def __order_clockwise_batched__(nodes: List, origin: Tuple[numeric, numeric], pos: Union[str, dict, None]) -> List:
+    # Same ordering as __order_clockwise__, but with all angles computed and sorted in one go
+    coordinates = np.fromiter((c for nb in nodes for c in pos[nb]), dtype=float, count=2 * len(nodes)).reshape(-1, 2)
+    dx = coordinates[:, 0] - origin[0]
+    dy = coordinates[:, 1] - origin[1]
 
-    return sorted(nodes, key=lambda nb: __get_angle_between_nodes__(origin, pos[nb]))
+    angles = np.arctan2(dx, dy)
+    angles = np.where(angles < 0, angles + 2 * math.pi, angles)
+    angles[(dx == 0) & (dy == 0)] = 0
+
+    return [nodes[i] for i in np.argsort(angles, kind='stable')]
 
 
 def __edge_angles__(nodes: List, origin: Tuple[numeric, numeric], pos: Union[str, dict, None], deg: bool = False) \
         -> List:
-    ordered_nodes = __order_clockwise__(nodes, origin, pos)
+    return __ordered_edge_angles__(__order_clockwise__(nodes, origin, pos), origin, pos, deg)
 
-    angles = []
-    origin = Vector.from_point(origin)
 
+def __ordered_edge_angles__(ordered_nodes: List, origin: Tuple[numeric, numeric], pos: Union[str, dict, None],
+                            deg: bool = False) -> List:
     if len(ordered_nodes) <= 1:
-        angles.append(Angle(math.pi * 2))
+        angles = np.array([math.pi * 2])
     else:
-        for i in range(len(ordered_nodes)):
-            p_nb_a = Vector.from_point(pos[ordered_nodes[i]])
-            p_nb_b = Vector.from_point(pos[ordered_nodes[(i + 1) % len(ordered_nodes)]])
-            vector_nb_a = p_nb_a - origin
-            vector_nb_b = p_nb_b - origin
-            angle = vector_nb_a.angle(vector_nb_b)
-            angles.append(angle)
+        # Clockwise angle from each edge to the next one, with the same convention as Vector.angle
+        coordinates = np.fromiter((c for nb in ordered_nodes for c in pos[nb]), dtype=float,
+                                  count=2 * len(ordered_nodes)).reshape(-1, 2)
+        vector_a = coordinates - (origin[0], origin[1])
+        vector_b = np.roll(vector_a, -1, axis=0)
+
+        det = vector_b[:, 0] * vector_a[:, 1] - vector_b[:, 1] * vector_a[:, 0]
+        dot = vector_b[:, 0] * vector_a[:, 0] + vector_b[:, 1] * vector_a[:, 1]
+        angles = np.arctan2(det, dot)
+        angles = np.where(angles < 0, angles + 2 * math.pi, angles)
+
+        is_zero_a = (vector_a[:, 0] == 0) & (vector_a[:, 1] == 0)
+        angles[is_zero_a | np.roll(is_zero_a, -1)] = 0
 
-    return [angle.deg() if deg else angle.rad() for angle in angles]
+    return (np.degrees(angles) if deg else angles).tolist()
 
 
-def combinatorial_embedding(g: nx.Graph, pos: Union[str, dict, None] = None) -> dict:
+def combinatorial_embedding(g: nx.Graph, pos: Union[str, dict, None] = None, n_jobs: int = 1) -> dict:
     """
     Returns the combinatorial embedding for the given networkX graph g.
 
@@ -180,14 +257,56 @@ def combinatorial_embedding(g: nx.Graph, pos: Union[str, dict, None] = None) ->
     :param pos: Optional node position dictionary. If not supplied, node positions are read from the graph directly.
         If given as a string, the property under the given name in the networkX graph is used.
     :type pos: Union[str, dic, None]
+    :param n_jobs: Number of worker processes used to order the neighborhoods. -1 uses all available cores. Graphs
+        with less than 1000 nodes are always processed in the calling process.
+    :type n_jobs: int
     :return: The new node positions
     :rtype: dict
     """
     pos = common.get_node_positions(g, pos)
-    return {node: ordered_neighborhood(g, node, pos) for node in g.nodes()}
+    return _build_sorted_adj(g, pos, n_jobs)
+
+
+_PARALLEL_NODE_THRESHOLD = 1000
 
 
-def edge_angles(g: nx.Graph, node: object, pos: Union[str, dict, None] = None, deg: bool = False) -> List:
+def _build_sorted_adj(g: nx.Graph, pos: dict, n_jobs: int = 1) -> dict:
+    nodes = list(g.nodes())
+
+    if n_jobs == -1:
+        n_jobs = os.cpu_count() or 1
+
+    if n_jobs <= 1 or len(nodes) < _PARALLEL_NODE_THRESHOLD:
+        return _sorted_adj_vectorized(g, pos)
+
+    # Only hand the neighborhoods and the positions to the workers instead of pickling the whole graph
+    neighborhoods = [(node, _neighbors(g, node)) for node in nodes]
+    chunk_size = math.ceil(len(neighborhoods) / n_jobs)
+    chunks = [neighborhoods[i:i + chunk_size] for i in range(0, len(neighborhoods), chunk_size)]
+
+    sorted_adj = {}
+    with ProcessPoolExecutor(max_workers=n_jobs) as executor:
+        for chunk_result in executor.map(_order_neighborhoods, chunks, [pos] * len(chunks)):
+            sorted_adj.update(chunk_result)
+
+    return sorted_adj
+
+
+def _sorted_adj_vectorized(g: nx.Graph, pos: dict) -> dict:
+    nodes, source, target, _, _ = _clockwise_neighborhoods(g, pos)
+
+    ordered = [nodes[i] for i in target.tolist()]
+    bounds = np.cumsum(np.bincount(source, minlength=len(nodes))).tolist()
+
+    return {node: ordered[start:end] for node, start, end in zip(nodes, [0] + bounds, bounds)}
+
+
+def _order_neighborhoods(neighborhoods: List[Tuple[object, List]], pos: dict) -> dict:
+    return {node: __order_clockwise__(neighbors, pos[node], pos) for node, neighbors in neighborhoods}
+
+
+def edge_angles(g: nx.Graph, node: object, pos: Union[str, dict, None] = None, deg: bool = False,
+                sorted_adj: Optional[dict] = None) -> List:
     """
     Returns a list of edge angles for the given node present in the networkX graph.
 
@@ -201,13 +320,85 @@ def edge_angles(g: nx.Graph, node: object, pos: Union[str, dict, None] = None, d
     :param deg: If true, the angles are returned as degrees in the range of (0,360). Otherwise, the angles are returned
         as radians.
     :type deg: bool
+    :param sorted_adj: Optional combinatorial embedding as returned by :func:`combinatorial_embedding`. If supplied,
+        the clockwise order of the neighborhood is taken from it instead of being recomputed.
+    :type sorted_adj: Optional[dict]
     :return: List of angles between the edges in a clockwise order
     :rtype: List
     """
     pos = common.get_node_positions(g, pos)
-    neighbors = ordered_neighborhood(g, node, pos)
+    neighbors = sorted_adj[node] if sorted_adj is not None else ordered_neighborhood(g, node, pos)
+
+    return __ordered_edge_angles__(neighbors, pos[node], pos, deg)
+
+
+def _clockwise_neighborhoods(g: nx.Graph, pos: dict) -> Tuple[List, np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Orders the neighborhoods of all nodes clockwise in one pass.
+
+    Returns the nodes in the order of g.nodes() together with flat (source, target) index arrays, which are grouped by
+    source and ordered clockwise within each group, the clockwise angle of each of these edges and whether the edge
+    has length zero.
+    """
+    nodes = list(g.nodes())
+    node_to_index = {node: i for i, node in enumerate(nodes)}
+
+    # Flatten the neighborhoods of all nodes into (source, target) index pairs
+    source = []
+    target = []
+    for i, node in enumerate(nodes):
+        for neighbor in _neighbors(g, node):
+            source.append(i)
+            target.append(node_to_index[neighbor])
+
+    source = np.asarray(source, dtype=np.intp)
+    target = np.asarray(target, dtype=np.intp)
+    pos_array = np.fromiter((c for node in nodes for c in pos[node]), dtype=float, count=2 * len(nodes)).reshape(-1, 2)
 
-    return __edge_angles__(neighbors, pos[node], pos, deg)
+    diffs = pos_array[target] - pos_array[source]
+
+    # Clockwise angle starting from the upwards direction, see __clockwise_angle__
+    theta = np.arctan2(diffs[:, 0], diffs[:, 1])
+    theta = np.where(theta < 0, theta + 2 * np.pi, theta)
+    is_zero = (diffs[:, 0] == 0) & (diffs[:, 1] == 0)
+    theta[is_zero] = 0
+
+    # The pairs are already grouped by source, so only the angles within each group need to be sorted. The sort is
+    # stable, so ties keep the order of the adjacency just like in __order_clockwise__.
+    order = np.lexsort((theta, source))
+    return nodes, source, target[order], theta[order], is_zero[order]
+
+
+def _minimum_edge_angles(g: nx.Graph, pos: dict) -> np.ndarray:
+    r"""
+    Returns the minimum angle in radians between any two consecutive edges around each node, in the order of
+    g.nodes(). Nodes with less than two incident edges are assigned an angle of :math:`2\pi`.
+    """
+    nodes, source, _, theta, is_zero = _clockwise_neighborhoods(g, pos)
+    n = len(nodes)
+
+    minimum = np.full(n, 2 * np.pi)
+    if len(source) == 0:
+        return minimum
+
+    degree = np.bincount(source, minlength=n)
+    with_edges = np.flatnonzero(degree > 0)
+    last = np.cumsum(degree) - 1
+    first = last - degree + 1
+
+    # Angle from each edge to its clockwise successor, wrapping around from the last to the first edge of a node
+    gaps = np.empty_like(theta)
+    gaps[:-1] = theta[1:] - theta[:-1]
+    gaps[last[with_edges]] = theta[first[with_edges]] + 2 * np.pi - theta[last[with_edges]]
+
+    # Edges of length zero form an angle of 0 with any other edge
+    has_multiple_edges = degree[source] > 1
+    gaps[is_zero & has_multiple_edges] = 0
+    gaps[~has_multiple_edges] = 2 * np.pi
+
+    minimum[with_edges] = np.minimum.reduceat(gaps, first[with_edges])
+
+    return minimum
 
 
 def minimum_angle(g: nx.Graph, pos: Union[str, dict, None] = None, deg: bool = False) -> float:
@@ -227,15 +418,9 @@ def minimum_angle(g: nx.Graph, pos: Union[str, dict, None] = None, deg: bool = F
     """
     pos = common.get_node_positions(g, pos)
 
-    minimum = 360 if deg else math.pi * 2
-
-    for node in g.nodes():
-        resolution = min(edge_angles(g, node, pos, deg))
-
-        if resolution < minimum:
-            minimum = resolution
+    minimum = min(float(np.min(_minimum_edge_angles(g, pos), initial=math.pi * 2)), math.pi * 2)
 
-    return minimum
+    return float(np.degrees(minimum)) if deg else minimum
 
 
 def angular_resolution(g: nx.Graph, pos: Union[str, dict, None] = None, deg: bool = False) -> float:
@@ -265,7 +450,11 @@ def angular_resolution(g: nx.Graph, pos: Union[str, dict, None] = None, deg: boo
     node_count = 0
     deviation_sum = 0
 
-    for node in g.nodes():
+    minimum_angles = _minimum_edge_angles(g, pos)
+    if deg:
+        minimum_angles = np.degrees(minimum_angles)
+
+    for node, minimum_angle in zip(g.nodes(), minimum_angles):
         neighbours = sum(1 for _ in g.neighbors(node))
 
         if neighbours <= 1:
@@ -273,10 +462,8 @@ def angular_resolution(g: nx.Graph, pos: Union[str, dict, None] = None, deg: boo
 
         node_count += 1
 
-        optimal_angle = Angle(2 * math.pi) / neighbours
-        minimum_angle = Angle(min(edge_angles(g, node, pos, deg)))
-
-        deviation_sum += abs(((optimal_angle - minimum_angle) / optimal_angle))
+        optimal_angle = (360 if deg else 2 * math.pi) / neighbours
+        deviation_sum += abs((optimal_angle - float(minimum_angle)) / optimal_angle)
 
     return deviation_sum / node_count if node_count > 0 else 0
 
@@ -296,17 +483,14 @@ def edge_orthogonality(g: nx.Graph, pos: Union[str, dict, None] = None) -> float
     :rtype: float
     """
 
-    pos = common.get_node_positions(g, pos)
+    diffs = _edge_vectors(g, *_positions(g, pos))
 
-    total = 0
-    for edge in g.edges():
-        v_edge = Vector.from_point(pos[edge[1]]) - Vector.from_point(pos[edge[0]])
-        angle = v_edge.angle(Vector(1, 0))
-        degree_deviation = angle % (math.pi / 2)
-        degree_deviation = min(degree_deviation, math.pi / 2 - degree_deviation)
-        total += degree_deviation * 4 / math.pi
+    # Taking the absolute values folds all four quadrants onto the first one
+    angles = np.arctan2(np.abs(diffs[:, 1]), np.abs(diffs[:, 0]))
+    degree_deviation = np.minimum(angles, np.pi / 2 - angles)
 
-    return 1 - (total / len(g.edges()))
+    # Scale once after the (pairwise) summation instead of every element before it
+    return 1 - float(np.add.reduce(degree_deviation)) * 4 / np.pi / len(degree_deviation)
 
 
 def edge_length_deviation(g: nx.Graph, pos: Union[str, dict, None] = None, ideal_length: float = None) -> float:
@@ -329,7 +513,12 @@ def edge_length_deviation(g: nx.Graph, pos: Union[str, dict, None] = None, ideal
         return 0
 
     pos = common.get_node_positions(g, pos)
+    edge_count = g.number_of_edges()
+
+    # Filling the buffer straight from the edge iterator is cheaper than gathering from a position array here, as no
+    # node index lookup is needed
+    edge_lengths = np.fromiter((math.dist(pos[source], pos[target]) for source, target in g.edges()),
+                               dtype=float, count=edge_count)
 
-    edge_lengths = [common.euclidean_distance(pos[edge[0]], pos[edge[1]]) for edge in g.edges()]
-    average = ideal_length if ideal_length is not None else np.average(edge_lengths)
-    return np.average([abs(average - edge_length) / average for edge_length in edge_lengths])
+    average = ideal_length if ideal_length is not None else np.add.reduce(edge_lengths) / edge_count
+    return float(np.add.reduce(np.abs(edge_lengths - average)) / edge_count / average)
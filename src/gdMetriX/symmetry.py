@@ -25,186 +25,308 @@ Methods
 from __future__ import annotations
 
 import math
+import os
+from concurrent.futures import ProcessPoolExecutor
 from enum import Enum
-from typing import Union, Tuple
+from typing import Union, Tuple, List
 
-import matplotlib.pyplot as plt
 import networkx as nx
 import numpy as np
 from scipy import ndimage
 from scipy.spatial import ConvexHull, QhullError, KDTree
 
 from gdMetriX import crossings, common, boundary
-from gdMetriX.common import numeric, Vector
+from gdMetriX.common import numeric
 from gdMetriX.distribution import smallest_enclosing_circle_from_point_set
 
 
-def _flip_point_around_axis(p: np.array, a: np.array, b: np.array) -> np.array:
+def _flip_points_around_axis(points: np.array, a: np.array, b: np.array) -> np.array:
     m = (a + b) / 2
     v_ab = b - a
-    v_mp = p - m
+    v_mp = points - m
 
     # Obtain the perpendicular bisector
     v_ab_rot = np.asarray((v_ab[1], v_ab[0] * -1))
     v_ab_rot_norm = v_ab_rot / np.linalg.norm(v_ab_rot)
 
-    projection = m + v_mp.dot(
-        v_ab_rot_norm) * v_ab_rot_norm
+    projection = m + (v_mp @ v_ab_rot_norm)[:, np.newaxis] * v_ab_rot_norm
 
-    v_pl = projection - p
-    return p + 2 * v_pl
+    v_pl = projection - points
+    return points + 2 * v_pl
 
 
-def reflective_symmetry(g: nx.Graph, pos: Union[str, dict, None] = None, threshold: int = 2,
-                        tolerance: float = 1e-2, fraction: float = 1) -> float:
-    r"""
-    Computes a metric for axial symmetry between 0 and 1 as defined by :footcite:t:`purchase_metrics_2002`.
+def _flip_point_around_axis(p: np.array, a: np.array, b: np.array) -> np.array:
+    return _flip_points_around_axis(np.asarray(p)[np.newaxis, :], a, b)[0]
 
-    The metric sums up the symmetry for all axes defined by pairs of points. For each such axis, a symmetry value
-    is calculated for all subgraphs with sufficiently many reflected nodes. The symmetry values for each subgraph
-    are weighted by the area of the subgraph and summed up.
 
-    Note that, with a worst-case runtime of :math:`O(n^7)` and a best-case runtime of :math:`O(n^5)`,
-    the metric is computationally very expensive.
+# Up to this number of points, the convex hull area is computed directly instead of calling Qhull, whose fixed setup
+# cost dominates for small point sets
+_SMALL_HULL_SIZE = 32
 
-    :param g: A networkX graph
-    :type g: nx.Graph
-    :param pos: Optional node position dictionary. If not supplied, node positions are read from the graph directly.
-            If given as a string, the property under the given name in the networkX graph is used.
-    :type pos: Union[str, dic, None]
-    :param threshold: The minimum number of edges a subgraph needs in order to be considered to be symmetric
-    :type threshold: int
-    :param tolerance: The tolerance for when two points should be considered to be at the same position.
-    :type tolerance: float
-    :param fraction: A weighing of how much crossings and endpoints should be distinguished between 0 and 1. 1 means
-            that we do not care about whether a point is a crossing or an endpoint regarding detecting symmetry and the
-            two are treated equally.
-    :type fraction:
-    :return: Axial symmetry estimate between 0 and 1
-    :rtype: float
-    """
 
-    def _subgraph_area(nodes) -> float:
+def _cross(o, a, b) -> float:
+    return (a[0] - o[0]) * (b[1] - o[1]) - (a[1] - o[1]) * (b[0] - o[0])
+
+
+def _half_hull(points) -> list:
+    hull = []
+    for point in points:
+        while len(hull) >= 2 and _cross(hull[-2], hull[-1], point) <= 0:
+            hull.pop()
+        hull.append(point)
+    return hull
+
+
+def _convex_hull_area(points: np.array) -> float:
+    if len(points) > _SMALL_HULL_SIZE:
         try:
-            ch = ConvexHull(list([[pos[node][0], pos[node][1]] for node in nodes]))
-            return ch.volume
+            return ConvexHull(points).volume
         except QhullError:
             return 0
 
-    def _is_crossing_node(node):
-        node = g.nodes[node]
-        return 'is_elevated_crossing' in node and node['is_elevated_crossing']
+    # Andrew's monotone chain on the lexicographically sorted points, followed by the shoelace formula
+    points = np.unique(points, axis=0).tolist()
+    if len(points) < 3:
+        return 0
+
+    hull = np.asarray(_half_hull(points)[:-1] + _half_hull(reversed(points))[:-1])
+    if len(hull) < 3:
+        return 0
+
+    x, y = hull[:, 0], hull[:, 1]
+    return 0.5 * abs(float(np.dot(x, np.roll(y, -1)) - np.dot(y, np.roll(x, -1))))
+
+
+def _draw_segment(image: np.array, start: Tuple[float, float], end: Tuple[float, float], half_width: float):
+    """
+    Draws an anti-aliased line segment of the given half width onto the image, where start and end are given as
+    (row, column) with pixel centers at half-integers. The approximate coverage of each pixel by the line is blended
+    over the existing image like an opaque brush with anti-aliased edges.
+    """
+    start = np.asarray(start, dtype=float)
+    end = np.asarray(end, dtype=float)
+    direction = end - start
+    length_squared = float(direction @ direction)
+
+    # Walk along the dominant axis and cover a band around the line in the other one
+    major = 0 if abs(direction[0]) >= abs(direction[1]) else 1
+    minor = 1 - major
+    reach = half_width + 1
+
+    low, high = sorted((start[major], end[major]))
+    major_pixels = np.arange(math.floor(low - reach), math.ceil(high + reach))
+    if length_squared == 0:
+        minor_center = np.full(len(major_pixels), start[minor])
+    else:
+        # The dominant component of a non-degenerate direction is never zero
+        t = np.clip((major_pixels + 0.5 - start[major]) / direction[major], 0, 1)
+        minor_center = start[minor] + t * direction[minor]
+
+    band = math.ceil(reach * math.sqrt(2))
+    minor_pixels = np.floor(minor_center)[:, np.newaxis] + np.arange(-band, band + 1)
+    major_pixels = np.broadcast_to(major_pixels[:, np.newaxis], minor_pixels.shape)
+
+    pixels = np.empty(minor_pixels.shape + (2,))
+    pixels[..., major] = major_pixels
+    pixels[..., minor] = minor_pixels
+
+    inside = np.all((pixels >= 0) & (pixels < image.shape), axis=-1)
+    pixels = pixels[inside]
+
+    # Distance of the pixel centers to the segment
+    offset = pixels + 0.5 - start
+    if length_squared == 0:
+        closest = offset
+    else:
+        t = np.clip(offset @ direction / length_squared, 0, 1)
+        closest = offset - t[:, np.newaxis] * direction
+    distance = np.sqrt(np.einsum('ij,ij->i', closest, closest))
+
+    coverage = np.clip(half_width + 0.5 - distance, 0, 1)
+    rows, columns = pixels[:, 0].astype(int), pixels[:, 1].astype(int)
+    image[rows, columns] = 1 - (1 - image[rows, columns]) * (1 - coverage)
+
+
+def _reflective_axes_symmetry(node_positions: np.array, edge_indices: np.array, is_crossing_node: np.array,
+                              axes: List[Tuple[int, int]], threshold: int, tolerance: float,
+                              fraction: float) -> Tuple[float, float]:
+    """
+    Sums up the area-weighted symmetry and the area of the symmetric subgraphs for the given axes, each defined by a
+    pair of node indices. Works on plain index arrays, so that it can be run in worker processes.
+    """
 
     def _subgraph_symmetry(edge_pairs) -> float:
 
         if fraction == 1 or len(edge_pairs) == 0:
             return 1
-        else:
-            total = 0
 
-            for pair_1, pair_2 in edge_pairs:
-                factor_1 = fraction if _is_crossing_node(pair_1[0]) != _is_crossing_node(pair_1[1]) else 1
-                factor_2 = fraction if _is_crossing_node(pair_2[0]) != _is_crossing_node(pair_2[1]) else 1
+        a_1, b_1, a_2, b_2 = np.asarray(edge_pairs, dtype=np.intp).T
 
-                total += factor_1 * factor_2
+        factor_1 = np.where(is_crossing_node[a_1] != is_crossing_node[b_1], fraction, 1.0)
+        factor_2 = np.where(is_crossing_node[a_2] != is_crossing_node[b_2], fraction, 1.0)
 
-        return total / len(edge_pairs)
+        return float(np.add.reduce(factor_1 * factor_2)) / len(edge_pairs)
 
     def _find_mirrored_nodes(pos_a, pos_b):
 
-        node_positions = np.array([pos[node] for node in node_list])
-        node_positions_mirrored = np.array([_flip_point_around_axis(pos[node], pos_a, pos_b) for node in node_list])
+        node_positions_mirrored = _flip_points_around_axis(node_positions, pos_a, pos_b)
 
-        kdtree = KDTree(node_positions)
-        kdtree_mirrored = KDTree(node_positions_mirrored)
+        # As the reflection preserves distances, a node has a mirrored partner if and only if its own mirrored
+        # position is close to some node. Thus, a nearest neighbour query against the tree over the original
+        # positions suffices and no tree has to be built for the mirrored positions.
+        distances, _ = kdtree.query(node_positions_mirrored, k=1, distance_upper_bound=upper_bound)
 
-        matching_pairs = list(kdtree.query_ball_tree(kdtree_mirrored, r=tolerance))
+        return np.flatnonzero(np.isfinite(distances)), node_positions_mirrored
 
-        mirrored_nodes = []
-        matching_pairs_dic = {}
+    def _find_mirror_partners(node_positions_mirrored):
+        return kdtree.query_ball_point(node_positions_mirrored, r=tolerance)
 
-        for i in range(len(matching_pairs)):
+    n = len(node_positions)
+    kdtree = KDTree(node_positions)
+    # The upper bound of KDTree.query is exclusive, whereas the tolerance is inclusive
+    upper_bound = np.nextafter(tolerance, np.inf)
 
-            if len(matching_pairs[i]) > 0:
-                mirrored_nodes.append(node_list[i])
+    if fraction != 1:
+        # Both directions, so checking for a mirrored edge is a single lookup
+        index_edges = set(map(tuple, edge_indices.tolist()))
+        index_edges.update([(v, u) for u, v in index_edges])
 
-            matching_pairs_dic[node_list[i]] = matching_pairs[i]
+    total_area = 0.0
+    total_symmetry = 0.0
 
-        return mirrored_nodes, matching_pairs_dic
+    for i_a, i_b in axes:
+        pos_a = node_positions[i_a]
+        pos_b = node_positions[i_b]
 
-    if g.order() <= 1:
-        return 1
+        mirrored_indices, node_positions_mirrored = _find_mirrored_nodes(pos_a, pos_b)
 
-    convex_hull_area = boundary.area_tight(g, pos)
-    if convex_hull_area <= 0:
-        return 1
+        if len(mirrored_indices) <= math.floor(math.sqrt(threshold)):
+            # In this case there cannot even be enough reflected edges
+            # Abort before we even build the subgraph G_alpha
+            continue
 
-    # Get node positions
-    g = nx.edge_subgraph(g, g.edges()).copy()
+        # A subgraph without area adds nothing to either the symmetry or the area sum, so we can skip it before
+        # building the subgraph and matching its edges
+        sub_area = _convex_hull_area(node_positions[mirrored_indices])
+        if sub_area == 0:
+            continue
 
-    pos = common.get_node_positions(g, pos)
-    nx.set_node_attributes(g, pos, 'pos')
+        # Edges of the subgraph of symmetric nodes
+        is_mirrored = np.zeros(n, dtype=bool)
+        is_mirrored[mirrored_indices] = True
+        subgraph_edges = edge_indices[is_mirrored[edge_indices[:, 0]] & is_mirrored[edge_indices[:, 1]]]
 
-    # Planarize by replacing crossings with nodes
-    crossings.planarize(g)
-    pos = common.get_node_positions(g)
-    n = len(g.nodes())
+        if len(subgraph_edges) <= threshold:
+            continue
 
-    total_area = 0.0
-    total_symmetry = 0.0
+        if fraction == 1:
+            sub_sym = 1
+        else:
 
-    node_list = list(g.nodes())
+            # Obtain all mirrored edges
+            mirrored_node_pairs = _find_mirror_partners(node_positions_mirrored)
+            subgraph_edge_pairs = []
 
-    for i_a, node_a in enumerate(node_list):
-        for i_b in range(i_a, n):
-            node_b = node_list[i_b]
+            for a, b in subgraph_edges.tolist():
+                for mirror_of_a in mirrored_node_pairs[a]:
+                    for mirror_of_b in mirrored_node_pairs[b]:
+                        if (mirror_of_a, mirror_of_b) in index_edges:
+                            subgraph_edge_pairs.append((a, b, mirror_of_a, mirror_of_b))
 
-            if node_a == node_b or (pos[node_a][0] == pos[node_b][0] and pos[node_a][1] == pos[node_b][1]):
-                continue
+            sub_sym = _subgraph_symmetry(subgraph_edge_pairs)
 
-            # Iterate over all node pairs
+        total_symmetry += sub_sym * sub_area
+        total_area += sub_area
 
-            pos_a = np.asarray(pos[node_a])
-            pos_b = np.asarray(pos[node_b])
+    return total_symmetry, total_area
 
-            mirrored_nodes, mirrored_node_pairs = _find_mirrored_nodes(pos_a, pos_b)
 
-            if len(mirrored_nodes) <= math.floor(math.sqrt(threshold)):
-                # In this case there cannot even be enough reflected edges
-                # Abort before we even build the subgraph G_alpha
-                continue
+_PARALLEL_REFLECTIVE_NODE_THRESHOLD = 50
 
-            # Build a subgraph of symmetric nodes
-            symmetric_subgraph = g.subgraph(mirrored_nodes)
-            subgraph_edges = list(symmetric_subgraph.edges)
 
-            if len(subgraph_edges) <= threshold:
-                continue
+def reflective_symmetry(g: nx.Graph, pos: Union[str, dict, None] = None, threshold: int = 2,
+                        tolerance: float = 1e-2, fraction: float = 1, n_jobs: int = 1) -> float:
+    r"""
+    Computes a metric for axial symmetry between 0 and 1 as defined by :footcite:t:`purchase_metrics_2002`.
 
-            if fraction == 1:
-                sub_sym = 1
-            else:
+    The metric sums up the symmetry for all axes defined by pairs of points. For each such axis, a symmetry value
+    is calculated for all subgraphs with sufficiently many reflected nodes. The symmetry values for each subgraph
+    are weighted by the area of the subgraph and summed up.
 
-                # Obtain all mirrored edges
-                subgraph_edge_pairs = []
+    Note that, with a worst-case runtime of :math:`O(n^7)` and a best-case runtime of :math:`O(n^5)`,
+    the metric is computationally very expensive.
 
-                for i, edge in enumerate(subgraph_edges):
+    :param g: A networkX graph
+    :type g: nx.Graph
+    :param pos: Optional node position dictionary. If not supplied, node positions are read from the graph directly.
+            If given as a string, the property under the given name in the networkX graph is used.
+    :type pos: Union[str, dic, None]
+    :param threshold: The minimum number of edges a subgraph needs in order to be considered to be symmetric
+    :type threshold: int
+    :param tolerance: The tolerance for when two points should be considered to be at the same position.
+    :type tolerance: float
+    :param fraction: A weighing of how much crossings and endpoints should be distinguished between 0 and 1. 1 means
+            that we do not care about whether a point is a crossing or an endpoint regarding detecting symmetry and the
+            two are treated equally.
+    :type fraction:
+    :param n_jobs: Number of worker processes the symmetry axes are distributed on. -1 uses all available cores.
+            Graphs with less than 50 nodes after planarization are always processed in the calling process.
+    :type n_jobs: int
+    :return: Axial symmetry estimate between 0 and 1
+    :rtype: float
+    """
+
+    if g.order() <= 1:
+        return 1
 
-                    a = edge[0]
-                    b = edge[1]
+    convex_hull_area = boundary.area_tight(g, pos)
+    if convex_hull_area <= 0:
+        return 1
 
-                    for mirror_of_a in mirrored_node_pairs[a]:
-                        mirror_of_a = node_list[mirror_of_a]
-                        for mirror_of_b in mirrored_node_pairs[b]:
-                            mirror_of_b = node_list[mirror_of_b]
-                            if g.has_edge(mirror_of_a, mirror_of_b) or g.has_edge(mirror_of_b, mirror_of_a):
-                                subgraph_edge_pairs.append(((a, b), (mirror_of_a, mirror_of_b)))
+    # Get node positions
+    pos = common.get_node_positions(g, pos)
+    g = nx.edge_subgraph(g, g.edges()).copy()
 
-                sub_sym = _subgraph_symmetry(subgraph_edge_pairs)
+    # Planarize by replacing crossings with nodes. Planarizing adds the positions of the crossing nodes to the given
+    # dictionary, so it works on a copy instead of the positions of the caller.
+    pos = {node: pos[node] for node in g.nodes()}
+    crossings.planarize(g, pos)
+    n = len(g.nodes())
 
-            sub_area = _subgraph_area(symmetric_subgraph.nodes)
-            total_symmetry += sub_sym * sub_area
-            total_area += sub_area
+    node_list = list(g.nodes())
+    node_positions = np.array([pos[node] for node in node_list], dtype=float).reshape(-1, 2)
+
+    # Node properties by index in node_list, so the inner loops do not have to look up the node attributes
+    node_index = {node: i for i, node in enumerate(node_list)}
+    is_crossing_node = np.fromiter((bool(g.nodes[node].get('is_elevated_crossing', False)) for node in node_list),
+                                   dtype=bool, count=n)
+
+    # Edges as pairs of node indices, so the edges between mirrored nodes can be selected without networkX views
+    edge_indices = np.array([(node_index[u], node_index[v]) for u, v in g.edges()], dtype=np.intp).reshape(-1, 2)
+
+    # All axes through two nodes at different positions
+    axes = [(i_a, i_b) for i_a in range(n) for i_b in range(i_a + 1, n)
+            if not np.array_equal(node_positions[i_a], node_positions[i_b])]
+
+    if n_jobs == -1:
+        n_jobs = os.cpu_count() or 1
+
+    if n_jobs <= 1 or n < _PARALLEL_REFLECTIVE_NODE_THRESHOLD:
+        total_symmetry, total_area = _reflective_axes_symmetry(node_positions, edge_indices, is_crossing_node, axes,
+                                                               threshold, tolerance, fraction)
+    else:
+        # Axes through earlier nodes are more frequent, so deal them out in turns to balance the chunks
+        chunks = [axes[i::n_jobs] for i in range(n_jobs)]
+
+        total_symmetry = 0.0
+        total_area = 0.0
+        with ProcessPoolExecutor(max_workers=n_jobs) as executor:
+            futures = [executor.submit(_reflective_axes_symmetry, node_positions, edge_indices, is_crossing_node,
+                                       chunk, threshold, tolerance, fraction) for chunk in chunks]
+            for future in futures:
+                chunk_symmetry, chunk_area = future.result()
+                total_symmetry += chunk_symmetry
+                total_area += chunk_area
 
     return total_symmetry / max(total_area, convex_hull_area)
 
@@ -220,51 +342,47 @@ class _SIFTFeature:
 
     def __init__(self, edge: Tuple[numeric, numeric], edge_pos, score):
 
-        point_a = common.Vector.from_point(edge_pos[0])
-        point_b = common.Vector.from_point(edge_pos[1])
+        x_a, y_a = edge_pos[0][0], edge_pos[0][1]
+        x_b, y_b = edge_pos[1][0], edge_pos[1][1]
+        dx, dy = x_b - x_a, y_b - y_a
 
-        self.mid = (point_a + point_b) / 2
-        self.length = common.euclidean_distance(edge_pos[0], edge_pos[1])
-        self.angle = ((common.Vector.from_point(edge_pos[1]) - (common.Vector.from_point(edge_pos[0])))
-                      .upward_and_forward_direction().rad())
+        self.mid = common.Vector((x_a + x_b) / 2, (y_a + y_b) / 2)
+        self.length = math.hypot(dx, dy)
+
+        # Angle of the edge direction pointing upwards and forwards, i.e., between 0 and pi
+        if dy < 0 or (dy == 0 and dx < 0):
+            dx, dy = -dx, -dy
+        self.angle = common.Angle(math.atan2(dy, dx))
         self.edge = edge
         self.score = score
 
-    def compare_scale(self, other: _SIFTFeature, sigma_scale: float) -> float:
-        """ Scale similarity """
-        top = -abs(self.length - other.length)
-        bottom = sigma_scale * (self.length + other.length)
-
-        if bottom == 0:
-            return 0
 
-        return math.exp(top / bottom) ** 2
+def _compare_scale(length_a, lengths_b: np.array, sigma_scale: float) -> np.array:
+    """ Scale similarity """
+    top = -np.abs(length_a - lengths_b)
+    bottom = sigma_scale * (length_a + lengths_b)
 
-    def compare_distance(self, other: _SIFTFeature, sigma_distance: float, is_distance_bound: bool):
-        """ Distance similarity """
-        if not is_distance_bound:
-            return 1
-        dist = self.mid.distance(other.mid)
-        return math.exp(- (dist ** 2) / (2 * sigma_distance * sigma_distance))
+    with np.errstate(divide='ignore', invalid='ignore'):
+        similarity = np.exp(top / bottom) ** 2
 
-    def compare_rotation(self, other: _SIFTFeature, theta: float = None):
-        """ Rotation similarity """
-        if theta is None:
-            return abs(math.cos(self.angle - other.angle))
-        else:
-            return abs(math.cos(self.angle + other.angle - 2 * theta))
+    return np.where(bottom == 0, 0, similarity)
 
 
-class _Axis:
+def _compare_distance(mid_a: np.array, mids_b: np.array, sigma_distance: float, is_distance_bound: bool) -> np.array:
+    """ Distance similarity """
+    if not is_distance_bound:
+        return np.ones(len(mids_b))
+    delta = mid_a - mids_b
+    dist = np.sqrt(delta[:, 0] ** 2 + delta[:, 1] ** 2)
+    return np.exp(- (dist ** 2) / (2 * sigma_distance * sigma_distance))
 
-    def __init__(self, pos, edge_a, edge_b, score):
-        self.pos = pos
-        self.edge_a = edge_a
-        self.edge_b = edge_b
-        self.score = score
 
-    def __str__(self):
-        return f"_Vote({self.pos}, {self.edge_a}, {self.edge_b}, {self.score})"
+def _compare_rotation(angle_a, angles_b: np.array, theta: np.array = None) -> np.array:
+    """ Rotation similarity """
+    if theta is None:
+        return np.abs(np.cos(angle_a - angles_b))
+    else:
+        return np.abs(np.cos(angle_a + angles_b - 2 * theta))
 
 
 class _AxesSystem:
@@ -280,18 +398,74 @@ class _AxesSystem:
         self.sigma_distance = sigma_distance
         self.is_distance_bound = distance_bound
         self.sigma_scale = sigma_scale
-        self.votes = []
 
-    def add_rotational_vote(self, feature):
+        # The votes are stored column-wise: the position and score of each vote and the ids of the two voting edges
+        self.vote_x = []
+        self.vote_y = []
+        self.vote_score = []
+        self.vote_edge_a = []
+        self.vote_edge_b = []
+
+        self.features = []
+        self.edge_ids = np.empty(0, dtype=int)
+        self.mids = np.empty((0, 2))
+        self.lengths = np.empty(0)
+        self.angles = np.empty(0)
+
+    def add_features(self, features: List[_SIFTFeature]):
+        """ Sets the features to vote with and caches their properties as arrays """
+        self.features = features
+
+        # Parallel edges of multigraphs share their id, so they are only counted once when concluding the voting
+        edge_index = {}
+        self.edge_ids = np.array([edge_index.setdefault(feature.edge, len(edge_index)) for feature in features],
+                                 dtype=int)
+
+        self.mids = np.array([(feature.mid.x, feature.mid.y) for feature in features], dtype=float).reshape(-1, 2)
+        self.lengths = np.array([feature.length for feature in features], dtype=float)
+        self.angles = np.array([feature.angle for feature in features], dtype=float)
+
+    def _add_vote(self, x: float, y: float, score: float, a: int, b: int):
+        self.vote_x.append(x)
+        self.vote_y.append(y)
+        self.vote_score.append(score)
+        self.vote_edge_a.append(self.edge_ids[a])
+        self.vote_edge_b.append(self.edge_ids[b])
+
+    def _add_votes(self, x: np.array, y: np.array, score: np.array, a: int):
+        """ Adds the votes of feature a with each feature after it """
+        self.vote_x.extend(x.tolist())
+        self.vote_y.extend(y.tolist())
+        self.vote_score.extend(score.tolist())
+        self.vote_edge_a.extend([self.edge_ids[a]] * len(x))
+        self.vote_edge_b.extend(self.edge_ids[a + 1:].tolist())
+
+    def _similarity(self, a: int, with_rotation: bool = False, theta: np.array = None) -> np.array:
+        """ Similarity of feature a to all features after it """
+        b = slice(a + 1, None)
+
+        sca = _compare_scale(self.lengths[a], self.lengths[b], self.sigma_scale)
+        dis = _compare_distance(self.mids[a], self.mids[b], self.sigma_distance, self.is_distance_bound)
+
+        if with_rotation:
+            return _compare_rotation(self.angles[a], self.angles[b], theta) * sca * dis
+        return sca * dis
+
+    def add_rotational_vote(self, a: int):
         """ Add rotational axis to voting """
-        self.votes.append(_Axis(feature.mid, feature.edge, feature.edge, 1))
-        pass
+        mid = self.features[a].mid
+        self._add_vote(mid.x, mid.y, 1, a, a)
+
+    def add_rotational_votes_from_two(self, a: int):
+        """ Add rotational axes to voting created from feature a and each feature after it """
+        scores = self._similarity(a)
 
-    def add_rotational_vote_from_two(self, feature_a, feature_b):
-        """ Add rotational axis to voting created from two edges """
-        sca = feature_a.compare_scale(feature_b, self.sigma_scale)
-        dis = feature_a.compare_distance(feature_b, self.sigma_distance, self.is_distance_bound)
-        score = sca * dis
+        for b, score in enumerate(scores.tolist(), start=a + 1):
+            self._add_rotational_vote_from_two(a, b, score)
+
+    def _add_rotational_vote_from_two(self, a: int, b: int, score: float):
+        feature_a = self.features[a]
+        feature_b = self.features[b]
 
         mid = feature_a.mid.mid(feature_b.mid)
         mid_diff = feature_b.mid - feature_a.mid
@@ -308,8 +482,7 @@ class _AxesSystem:
 
         if abs(radius) < 0.001 or abs(delta_angl) < 0.5 or abs(delta_angl - math.pi) < 0.05:
             # The rotational symmetry is centered at the mid itself
-            vote = _Axis(mid, feature_a.edge, feature_b.edge, score)
-            self.votes.append(vote)
+            self._add_vote(mid.x, mid.y, score, a, b)
         else:
             # Otherwise, find rotation points on boundary of radius (two opposite points)
 
@@ -335,8 +508,7 @@ class _AxesSystem:
                 # Should never by the case
                 return
 
-            vote = _Axis(center, feature_a.edge, feature_b.edge, score)
-            self.votes.append(vote)
+            self._add_vote(center.x, center.y, score, a, b)
 
             # Opposite point
             if radius > 0:
@@ -346,25 +518,27 @@ class _AxesSystem:
                 scaled_direction = direction * radius_2 * factor
                 center = mid + scaled_direction
 
-                vote = _Axis(center, feature_a.edge, feature_b.edge, score)
-                self.votes.append(vote)
+                self._add_vote(center.x, center.y, score, a, b)
 
     @staticmethod
-    def _parse_reflective_vote(angle: common.Angle, radius: float, score: float, edge_a, edge_b) -> _Axis:
-        while angle.rad() < 0:
-            angle += math.pi
+    def _parse_reflective_vote(angle: common.Angle, radius: float) -> Tuple[float, float]:
+        angle = angle.rad()
+        if angle < 0:
+            angle %= math.pi
 
         if radius < 0:
-            radius = abs(radius)
+            # The angle lies below 3/2 pi before, so at most one subtraction brings it back to at most 2 pi
+            radius = -radius
             angle += math.pi
-            while angle > math.pi * 2:
+            if angle > math.pi * 2:
                 angle -= math.pi
 
-        return _Axis(common.Vector(angle.deg(), radius), edge_a, edge_b, score)
+        return math.degrees(angle), radius
 
-    def add_reflective_vote(self, feature):
+    def add_reflective_vote(self, a: int):
         """ Add reflective axis to voting """
 
+        feature = self.features[a]
         mid = feature.mid
 
         edge_pos_a = common.Vector.from_point(self.pos[feature.edge[0]])
@@ -375,80 +549,74 @@ class _AxesSystem:
 
         # Symmetry axis along perpendicular bisector
         r_ij = mid.x * math.cos(theta_ij_bisector.rad()) + mid.y * math.sin(theta_ij_bisector.rad())
-        self.votes.append(self._parse_reflective_vote(theta_ij_bisector, r_ij, 1, feature.edge, feature.edge))
+        self._add_vote(*self._parse_reflective_vote(theta_ij_bisector, r_ij), 1, a, a)
 
         # Symmetry axis along edge itself
         r_ij = mid.x * math.cos(theta_ij.rad()) + mid.y * math.sin(theta_ij.rad())
-        self.votes.append(self._parse_reflective_vote(theta_ij, r_ij, 1, feature.edge, feature.edge))
+        self._add_vote(*self._parse_reflective_vote(theta_ij, r_ij), 1, a, a)
 
-    def add_reflective_vote_from_two(self, feature_a, feature_b):
-        """ Add reflective axis to voting created from two edges """
+    def add_reflective_votes_from_two(self, a: int):
+        """ Add reflective axes to voting created from feature a and each feature after it """
 
-        theta_ij = (feature_a.mid - feature_b.mid).rad() % math.pi
-        mid = feature_a.mid.mid(feature_b.mid)
-        r_ij = mid.x * math.cos(theta_ij) + mid.y * math.sin(theta_ij)
+        delta = self.mids[a] - self.mids[a + 1:]
+        theta_ij = np.arctan2(delta[:, 1], delta[:, 0]) % math.pi
+        mid = (self.mids[a] + self.mids[a + 1:]) / 2
+        r_ij = mid[:, 0] * np.cos(theta_ij) + mid[:, 1] * np.sin(theta_ij)
 
-        rot = feature_a.compare_rotation(feature_b, theta_ij)
-        sca = feature_a.compare_scale(feature_b, self.sigma_scale)
-        dis = feature_a.compare_distance(feature_b, self.sigma_distance, self.is_distance_bound)
-        score = rot * sca * dis
+        score = self._similarity(a, True, theta_ij)
 
-        self.votes.append(
-            self._parse_reflective_vote(theta_ij, r_ij, score, feature_a.edge, feature_b.edge))
+        # Same normalization as in _parse_reflective_vote, theta_ij already lies in [0, pi)
+        is_negative = r_ij < 0
+        r_ij = np.abs(r_ij)
+        theta_ij = np.where(is_negative, theta_ij + math.pi, theta_ij)
 
-    def add_translative_vote(self, feature_a, feature_b):
-        """ Add translative axis to voting """
+        self._add_votes(np.degrees(theta_ij), r_ij, score, a)
 
-        rot = feature_a.compare_rotation(feature_b)
-        sca = feature_a.compare_scale(feature_b, self.sigma_scale)
-        dis = feature_a.compare_distance(feature_b, self.sigma_distance, self.is_distance_bound)
+    def add_translative_votes(self, a: int):
+        """ Add translative axes to voting created from feature a and each feature after it """
 
-        delta = feature_a.mid - feature_b.mid
+        score = self._similarity(a, True)
 
-        if delta.y < 0:
-            delta *= -1
+        delta = self.mids[a] - self.mids[a + 1:]
+        delta[delta[:, 1] < 0] *= -1
 
-        score = rot * sca * dis
-        vote = _Axis(delta, feature_a.edge, feature_b.edge, score)
-        self.votes.append(vote)
+        self._add_votes(delta[:, 0], delta[:, 1], score, a)
 
-    def _points_too_close(self, pos_a, pos_b):
-        return abs(pos_a.x - pos_b.x) < self.x_min and abs(pos_a.y - pos_b.y) < self.y_min
+    def _too_close(self, x: np.array, y: np.array, other_x: float, other_y: float) -> np.array:
+        return (np.abs(x - other_x) < self.x_min) & (np.abs(y - other_y) < self.y_min)
 
-    def _find_maxima(self):
-        def _merge_close_point(value: float, merge_span: float):
-            return (int(value / merge_span)) * merge_span
+    def _find_maxima(self) -> np.array:
+        vote_x = np.asarray(self.vote_x, dtype=float)
+        vote_y = np.asarray(self.vote_y, dtype=float)
+        vote_score = np.asarray(self.vote_score, dtype=float)
 
-        voting_dic = {}
+        is_positive = vote_score > 0
+        vote_score = vote_score[is_positive]
 
-        # Group together close points
-        for vote in self.votes:
-            x_merged = _merge_close_point(vote.pos.x, self.x_merge)
-            y_merged = _merge_close_point(vote.pos.y, self.y_merge)
+        # Group together close points. Adding 0.0 turns -0.0 into 0.0, which is the same bin.
+        merged = np.empty((len(vote_score), 2))
+        merged[:, 0] = np.trunc(vote_x[is_positive] / self.x_merge) * self.x_merge + 0.0
+        merged[:, 1] = np.trunc(vote_y[is_positive] / self.y_merge) * self.y_merge + 0.0
 
-            key = Vector(x_merged, y_merged)
+        bins, first_vote, vote_bin = np.unique(merged, axis=0, return_index=True, return_inverse=True)
+        bin_score = np.bincount(vote_bin.ravel(), weights=vote_score, minlength=len(bins))
 
-            if vote.score <= 0:
-                continue
-
-            if key in voting_dic:
-                voting_dic[key] += vote.score
-            else:
-                voting_dic[key] = vote.score
+        # Find max-scoring points, ties are resolved by which point received its first vote first
+        by_first_vote = np.argsort(first_vote)
+        order = by_first_vote[np.argsort(-bin_score[by_first_vote], kind='stable')]
+        candidates = bins[order]
 
-        # Find max-scoring points
-        sorted_axes = list(sorted(voting_dic.keys(), key=lambda x: voting_dic[x], reverse=True))
+        # Greedily take the best remaining point and drop all candidates that are too close to it
+        top_axes = []
+        while len(candidates) > 0 and len(top_axes) < self.num_features:
+            top = candidates[0]
+            top_axes.append(top)
 
-        # Remove double-entries that are too close
-        for i in range(min(self.num_features, len(sorted_axes))):
-            j = i + 1
-            while j < len(sorted_axes):
-                if self._points_too_close(sorted_axes[i], sorted_axes[j]):
-                    sorted_axes.pop(j)
-                else:
-                    j += 1
+            candidates = candidates[1:]
+            too_close = self._too_close(candidates[:, 0], candidates[:, 1], top[0], top[1])
+            candidates = candidates[~too_close]
 
-        return sorted_axes[:min(self.num_features, len(sorted_axes))]
+        return np.array(top_axes).reshape(-1, 2)
 
     def conclude_voting(self, g: nx.Graph) -> float:
         """ Takes the top axes and counts the percentage of edges voting for at least one of them """
@@ -457,21 +625,17 @@ class _AxesSystem:
         if len(top_features) == 0:
             return 0
 
-        matching_edge_dic = set()
+        vote_x = np.asarray(self.vote_x, dtype=float)
+        vote_y = np.asarray(self.vote_y, dtype=float)
 
-        for vote in self.votes:
-            matched = False
+        matched = np.zeros(len(vote_x), dtype=bool)
+        for feature_x, feature_y in top_features:
+            matched |= self._too_close(vote_x, vote_y, feature_x, feature_y)
 
-            for feature in top_features:
-                if self._points_too_close(vote.pos, feature):
-                    matched = True
-                    break
+        matching_edges = np.union1d(np.asarray(self.vote_edge_a, dtype=int)[matched],
+                                    np.asarray(self.vote_edge_b, dtype=int)[matched])
 
-            if matched:
-                matching_edge_dic.add(vote.edge_a)
-                matching_edge_dic.add(vote.edge_b)
-
-        return len(matching_edge_dic) / float(len(top_features) * len(g.edges()))
+        return len(matching_edges) / float(len(top_features) * len(g.edges()))
 
 
 def edge_based_symmetry(g: nx.Graph, symmetry_type: SymmetryType, pos: Union[str, dict, None] = None,
@@ -522,24 +686,24 @@ def edge_based_symmetry(g: nx.Graph, symmetry_type: SymmetryType, pos: Union[str
                         x_min,
                         y_min)
     sift_features = [_SIFTFeature(e, (pos[e[0]], pos[e[1]]), 1) for e in g.edges()]
+    votes.add_features(sift_features)
+
+    # Resolve the voting functions once instead of comparing the symmetry type for each feature
+    if symmetry_type == SymmetryType.REFLECTIVE:
+        vote_from_two, vote_from_one = votes.add_reflective_votes_from_two, votes.add_reflective_vote
+    elif symmetry_type == SymmetryType.ROTATIONAL:
+        vote_from_two, vote_from_one = votes.add_rotational_votes_from_two, votes.add_rotational_vote
+    elif symmetry_type == SymmetryType.TRANSLATIONAL:
+        vote_from_two, vote_from_one = votes.add_translative_votes, None
+    else:
+        return votes.conclude_voting(g)
 
     for a in range(len(sift_features)):
-        feature_a = sift_features[a]
-
-        for b in range(a + 1, len(sift_features)):
-            feature_b = sift_features[b]
+        # All pairs (a, b) with b > a are compared at once
+        vote_from_two(a)
 
-            if symmetry_type == SymmetryType.REFLECTIVE:
-                votes.add_reflective_vote_from_two(feature_a, feature_b)
-            elif symmetry_type == SymmetryType.ROTATIONAL:
-                votes.add_rotational_vote_from_two(feature_a, feature_b)
-            elif symmetry_type == SymmetryType.TRANSLATIONAL:
-                votes.add_translative_vote(feature_a, feature_b)
-
-        if symmetry_type == SymmetryType.REFLECTIVE:
-            votes.add_reflective_vote(feature_a)
-        elif symmetry_type == SymmetryType.ROTATIONAL:
-            votes.add_rotational_vote(feature_a)
+        if vote_from_one is not None:
+            vote_from_one(a)
 
     return votes.conclude_voting(g)
 
@@ -579,33 +743,45 @@ def visual_symmetry(g: nx.Graph, pos: Union[str, dict, None] = None, resolution:
 
     pos = boundary.normalize_positions(g, pos)
 
-    def _build_canvas():
-        fig = plt.figure(1, figsize=(1, 1), dpi=resolution)
-        ax = plt.axes([0., 0., 1., 1.], frameon=False, xticks=[], yticks=[])
-        ax.set_xlim(-0.8, 0.8)
-        ax.set_ylim(-0.8, 0.8)
-        ax.set_facecolor((0, 0, 0))
-        fig.patch.set_facecolor((0, 0, 0))
-        canvas = fig.canvas
-        return canvas, fig, ax
+    # The drawing area spans [-0.8, 0.8] in both directions, with the first image row at the top. Edges are one point
+    # wide and nodes are dots of 1.5 points, snapped to the pixel grid like matplotlib does with its markers.
+    scale = resolution / 1.6
+    point = resolution / 72
+    edge_half_width = max(1.0, point) / 2
+    node_radius = max(1.0, 1.5 * point) / 2
 
-    def _draw_to_array(canvas):
-        return np.frombuffer(canvas.tostring_rgb(), dtype='uint8').reshape(*reversed(canvas.get_width_height()), 3)
+    def _to_pixel(position) -> Tuple[float, float]:
+        return (0.8 - position[1]) * scale, (position[0] + 0.8) * scale
 
     def _get_edge_image():
-        canvas, fig, ax = _build_canvas()
+        if g.is_directed():
+            return _get_directed_edge_image()
+
+        image = np.zeros((resolution, resolution))
+        for u, v in g.edges():
+            _draw_segment(image, _to_pixel(pos[u]), _to_pixel(pos[v]), edge_half_width)
+        return image
+
+    def _get_directed_edge_image():
+        # Arrowheads and the shortening of edges at their end nodes are left to matplotlib
+        from matplotlib.backends.backend_agg import FigureCanvasAgg
+        from matplotlib.figure import Figure
+
+        fig = Figure(figsize=(1, 1), dpi=resolution, facecolor=(0, 0, 0))
+        canvas = FigureCanvasAgg(fig)
+        ax = fig.add_axes((0., 0., 1., 1.), frameon=False, xticks=[], yticks=[])
+        ax.set_xlim(-0.8, 0.8)
+        ax.set_ylim(-0.8, 0.8)
+        ax.set_facecolor((0, 0, 0))
         nx.draw_networkx_edges(g, pos, edge_color='#f00', ax=ax)
         canvas.draw()
-        image = _draw_to_array(canvas)
-        fig.clf()
-        return image
+        return np.asarray(canvas.buffer_rgba())[:, :, 0].astype(float)
 
     def _get_node_image():
-        canvas, fig, ax = _build_canvas()
-        nx.draw_networkx_nodes(g, pos, node_size=.1, node_color='#0f0', ax=ax)
-        canvas.draw()
-        image = _draw_to_array(canvas)
-        fig.clf()
+        image = np.zeros((resolution, resolution))
+        for node in g.nodes():
+            center = tuple(math.floor(coordinate + 0.5) + 0.5 for coordinate in _to_pixel(pos[node]))
+            _draw_segment(image, center, center, node_radius)
         return image
 
     def _normalize_array(img):
@@ -615,8 +791,8 @@ def visual_symmetry(g: nx.Graph, pos: Union[str, dict, None] = None, resolution:
             return np.zeros_like(img)
         return (img - min_val) / (max_val - min_val)
 
-    edge_image = _normalize_array(_get_edge_image()[:, :, 0])
-    node_image = _normalize_array(_get_node_image()[:, :, 1])
+    edge_image = _normalize_array(_get_edge_image())
+    node_image = _normalize_array(_get_node_image())
     graph_image = edge_image + node_image
 
     # Translate to centroid
@@ -646,27 +822,45 @@ def visual_symmetry(g: nx.Graph, pos: Union[str, dict, None] = None, resolution:
             return .1
         return 0
 
+    # Scratch buffer for the differences, so that every sum is a single pass without temporary images
+    buffer = np.empty_like(graph_image)
+    half = shape[0] // 2
+
+    def _absolute_difference(a, b) -> float:
+        np.subtract(a, b, out=buffer[:len(a)])
+        return np.sum(np.abs(buffer[:len(a)], out=buffer[:len(a)]))
+
+    # Rotations by multiples of 90 degrees map pixels onto pixels, so only the diagonal angles need to be interpolated.
+    # The ones beyond 180 degrees are half turns of those below.
+    interpolated_images = {}
+
+    def _rotate(degree):
+        half_turns, remainder = divmod(degree, 180)
+        if remainder % 90 == 0:
+            return np.rot90(graph_image, degree // 90)
+        if remainder not in interpolated_images:
+            interpolated_images[remainder] = ndimage.rotate(graph_image, remainder, reshape=False)
+        return np.rot90(interpolated_images[remainder], 2 * half_turns)
+
     for i in range(0, 360, 45):
         # Rotate image
-        rotated_image = ndimage.rotate(graph_image, i, reshape=False)
+        rotated_image = _rotate(i)
         flipped_and_rotated = np.flip(rotated_image, 0)
 
         # Rotational symmetry
         if rotational and 0 < i <= 180:
-            rotational_difference_image = graph_image - rotated_image
-            rotational_difference = np.sum(np.abs(rotational_difference_image))
+            rotational_difference = _absolute_difference(graph_image, rotated_image)
             rotational_estimate += _get_axis_weight(i) * rotational_difference
 
         # Reflective symmetry
         if reflective and i < 180:
-            reflective_difference_image = rotated_image - flipped_and_rotated
-            reflective_difference = np.sum(np.abs(reflective_difference_image))
+            # The difference to the flipped image is mirrored itself, so the upper half suffices
+            reflective_difference = 2 * _absolute_difference(rotated_image[:half], flipped_and_rotated[:half])
             reflective_estimate += _get_axis_weight(i) * reflective_difference
 
         # Dihedral symmetry
         if dihedral:
-            dihedral_difference_image = flipped_and_rotated - graph_image
-            dihedral_difference = np.sum(np.abs(dihedral_difference_image))
+            dihedral_difference = _absolute_difference(flipped_and_rotated, graph_image)
             dihedral_estimate += _get_axis_weight(i) * dihedral_difference
 
     rotational_estimate /= 1 * original_sum
@@ -691,7 +885,7 @@ def stress(g: nx.Graph, pos: Union[str, dict, None] = None, scale_minimization:
             If given as a string, the property under the given name in the networkX graph is used.
     :type pos: Union[str, dic, None]
     :param scale_minimization: If true, the scale of the drawing is adjusted to minimize the stress. To be precise,
-            a parameter :math:`s` is calculated using a binary search, minimizing the following function:
+            the parameter :math:`s` minimizing the following function is calculated in closed form:
             :math:`\sum{i,j \in V} (s \cdot ||p_j - p_j|| - d_{ij})^2`
     :type scale_minimization:
     :return: Stress of the graph embedding
@@ -699,39 +893,34 @@ def stress(g: nx.Graph, pos: Union[str, dict, None] = None, scale_minimization:
     """
 
     pos = common.get_node_positions(g, pos)
-    shortest_path_distances = dict(nx.all_pairs_shortest_path_length(g))
-
-    def _get_stress(scale):
-        stress = 0
+    nodes = list(pos)
+    node_index = {node: i for i, node in enumerate(nodes)}
+    positions = np.array([pos[node] for node in nodes], dtype=float).reshape(-1, 2)
 
-        for i, p_i_key in enumerate(pos):
-            p_i = pos[p_i_key]
-            for j, p_j_key in enumerate(pos):
-                p_j = pos[p_j_key]
-                if i < j and p_j_key in shortest_path_distances[p_i_key]:
-                    d_ij = shortest_path_distances[p_i_key][p_j_key]
-                    euclidean_distance = common.euclidean_distance(p_i, p_j)
-                    stress += (euclidean_distance * scale - d_ij) ** 2 / (d_ij ** 2)
+    # Shortest path lengths and Euclidean distances of all pairs i < j with a path from i to j
+    path_lengths = np.full((len(nodes), len(nodes)), np.inf)
+    for source, lengths in nx.all_pairs_shortest_path_length(g):
+        if source in node_index:
+            targets = [(node_index[target], length) for target, length in lengths.items() if target in node_index]
+            path_lengths[node_index[source], [target for target, _ in targets]] = [length for _, length in targets]
 
-        return stress
+    i, j = np.nonzero(np.triu(np.isfinite(path_lengths), 1))
+    d_ij = path_lengths[i, j]
+    euclidean_distances = np.linalg.norm(positions[i] - positions[j], axis=1)
 
-    def _binary_search_optimize(s_min, s_max, epsilon=1e-4):
-
-        while s_max - s_min > epsilon:
-            s_mid1 = s_min + (s_max - s_min) / 3
-            s_mid2 = s_max - (s_max - s_min) / 3
-
-            stress_mid1 = _get_stress(s_mid1)
-            stress_mid2 = _get_stress(s_mid2)
-
-            if stress_mid1 < stress_mid2:
-                s_max = s_mid2
-            else:
-                s_min = s_mid1
-
-        return (s_min + s_max) / 2
+    def _get_stress(scale):
+        return float(np.sum((euclidean_distances * scale - d_ij) ** 2 / d_ij ** 2))
+
+    def _optimize_scale():
+        # The stress is a quadratic function of the scale, whose minimum is attained at the root of its derivative
+        ratios = euclidean_distances / d_ij
+        squared_sum = float(np.sum(ratios ** 2))
+        if squared_sum == 0:
+            # All nodes coincide, so the stress does not depend on the scale
+            return 1
+        return float(np.sum(ratios)) / squared_sum
 
-    optimal_scale = _binary_search_optimize(0.00000025, 4000000) if scale_minimization else 1
+    optimal_scale = _optimize_scale() if scale_minimization else 1
     return _get_stress(optimal_scale)
 
 
@@ -761,16 +950,20 @@ def even_neighborhood_distribution(g: nx.Graph, pos: Union[str, dict, None] = No
     if g.order() <= 2:
         return 1
 
+    # Neighborhoods are usually small, so plain coordinate tuples are cheaper than building arrays per node
+    positions = {node: (float(pos[node][0]), float(pos[node][1])) for node in g.nodes()}
+
     sum = 0
-    for i in g.nodes():
-        W_i = [pos[neighbor] for neighbor in g[i]]
-        W_i.append(pos[i])
+    for node in g.nodes():
+        W_i = [positions[neighbor] for neighbor in g[node]]
+        W_i.append(positions[node])
 
         if len(W_i) <= 2:
             continue
 
         center, radius = smallest_enclosing_circle_from_point_set(W_i)
-        barycenter = common.barycenter(W_i)
-        sum += center.distance(barycenter) / radius
+        barycenter_x = math.fsum(point[0] for point in W_i) / len(W_i)
+        barycenter_y = math.fsum(point[1] for point in W_i) / len(W_i)
+        sum += math.hypot(center.x - barycenter_x, center.y - barycenter_y) / radius
 
     return 1 - (sum / g.order())
@@ -21,29 +21,50 @@
 
 import inspect
 import math
+import os
 
 import matplotlib.pyplot as plt
 import networkx as nx
+import numpy as np
+from matplotlib.figure import Figure
 
 import gdMetriX.common
 from gdMetriX import crossings
 
+# Draw the graph whenever the detected crossings differ from the expected ones. Only meant for debugging, as showing
+# the figure blocks the test run with interactive backends.
+PLOT = False
+
+# If set, the drawings of differing crossings are written as '<title>.png' into this directory instead of being shown.
+# Figures are then rendered off-screen without involving pyplot or its GUI event loop.
+PLOT_DIRECTORY = None
+
 
 def __rotate_point__(point, angle):
     if isinstance(point, crossings.CrossingLine):
         return crossings.CrossingLine(__rotate_point__(point.point_a, angle),
                                       __rotate_point__(point.point_b, angle))
     if isinstance(point, crossings.CrossingPoint):
-        return crossings.CrossingPoint(__rotate_point__((point[0], point[1]), angle)[0],
-                                       __rotate_point__((point[0], point[1]), angle)[1])
+        return crossings.CrossingPoint(*__rotate_point__((point[0], point[1]), angle))
     rad = math.radians(angle % 360)
-    return (point[0] * math.cos(rad) - point[1] * math.sin(rad),
-            point[0] * math.sin(rad) + point[1] * math.cos(rad))
+    cos, sin = math.cos(rad), math.sin(rad)
+    return point[0] * cos - point[1] * sin, point[0] * sin + point[1] * cos
 
 
 def __rotate_graph__(g, angle):
-    for node, position in nx.get_node_attributes(g, "pos").items():
-        g.nodes[node]["pos"] = __rotate_point__(position, angle)
+    positions = nx.get_node_attributes(g, "pos")
+    if len(positions) == 0:
+        return
+
+    # Rotates all positions at once. Element-wise operations round exactly like __rotate_point__ does.
+    coordinates = np.array(list(positions.values()), dtype=float).reshape(-1, 2)
+    rad = math.radians(angle % 360)
+    cos, sin = math.cos(rad), math.sin(rad)
+    x_rotated = coordinates[:, 0] * cos - coordinates[:, 1] * sin
+    y_rotated = coordinates[:, 0] * sin + coordinates[:, 1] * cos
+
+    for node, x, y in zip(positions, x_rotated.tolist(), y_rotated.tolist()):
+        g.nodes[node]["pos"] = (x, y)
 
 
 def __rotate_crossings__(crossing_list, angle):
@@ -52,8 +73,12 @@ def __rotate_crossings__(crossing_list, angle):
         for crossing in crossing_list]
 
 
-def __draw_graph__(g: nx.Graph, title: str, crossings_a, crossings_b):
-    ax = plt.gca()
+def __draw_graph__(g: nx.Graph, title: str, crossings_a, crossings_b, path=None):
+    if path is None:
+        fig, ax = plt.subplots()
+    else:
+        fig = Figure()
+        ax = fig.add_subplot()
     ax.set_title(title)
 
     pos = gdMetriX.common.get_node_positions(g)
@@ -61,7 +86,7 @@ def __draw_graph__(g: nx.Graph, title: str, crossings_a, crossings_b):
     nx.draw_networkx_edges(g, pos, ax=ax)
     nx.draw_networkx_nodes(g, pos, ax=ax, node_size=20)
     ax.tick_params(left=True, bottom=True, labelleft=True, labelbottom=True)
-    plt.axis("on")
+    ax.axis("on")
 
     # Points
     points_a = list(filter(lambda cr: type(cr.pos) is gdMetriX.crossings.crossingDataTypes.CrossingPoint, crossings_a))
@@ -69,21 +94,26 @@ def __draw_graph__(g: nx.Graph, title: str, crossings_a, crossings_b):
 
     x_values = [point.pos[0] for point in points_a]
     y_values = [point.pos[1] for point in points_a]
-    plt.plot(x_values, y_values, 'rX', markersize=12)
+    ax.plot(x_values, y_values, 'rX', markersize=12)
 
     x_values = [point.pos[0] for point in points_b]
     y_values = [point.pos[1] for point in points_b]
-    plt.plot(x_values, y_values, 'gX', markersize=9)
+    ax.plot(x_values, y_values, 'gX', markersize=9)
 
-    plt.show()
+    if path is None:
+        plt.show()
+        plt.close(fig)
+    else:
+        fig.savefig(path)
 
 
 def __equal_crossings__(crossings_a, crossings_b, g, title):
     print("Expected {}".format(crossings_b))
     print("Actual   {}".format(crossings_a))
 
-    if sorted(crossings_b) != sorted(crossings_a):
-        __draw_graph__(g, title, crossings_a, crossings_b)
+    if (PLOT or PLOT_DIRECTORY is not None) and sorted(crossings_b) != sorted(crossings_a):
+        path = None if PLOT_DIRECTORY is None else os.path.join(PLOT_DIRECTORY, f"{title}.png")
+        __draw_graph__(g, title, crossings_a, crossings_b, path)
 
     assert sorted(crossings_a) == sorted(crossings_b)
 
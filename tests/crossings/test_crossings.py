@@ -18,22 +18,46 @@
     Unit tests for crossing detection.
 """
 
+import functools
 import math
 import random
 import unittest
-
-from libpysal import weights
-from libpysal.cg import voronoi_frames
+from typing import Tuple
 
 import networkx as nx
+import numpy as np
 # noinspection PyUnresolvedReferences
 import pytest
+from scipy.spatial import Delaunay
 
 
 import crossing_test_helper
 from gdMetriX import crossings, datasets
 
 
+@functools.lru_cache(maxsize=256)
+def __random_planar_layout__(n: int, seed: int) -> Tuple[Tuple[Tuple[int, int], ...], Tuple[Tuple[float, float], ...]]:
+    coordinates = np.random.default_rng(seed).random((n, 2))
+
+    # The edges of the delaunay triangulation form a planar straight-line drawing
+    simplices = Delaunay(coordinates).simplices
+    edges = np.sort(np.concatenate([simplices[:, [0, 1]], simplices[:, [1, 2]], simplices[:, [0, 2]]]), axis=1)
+    edges = np.unique(edges, axis=0)
+
+    return tuple(map(tuple, edges.tolist())), tuple(map(tuple, coordinates.tolist()))
+
+
+def __random_planar_graph__(n: int, seed: int) -> nx.Graph:
+    # The triangulation is cached, but every caller gets its own graph to modify
+    edges, coordinates = __random_planar_layout__(n, seed)
+
+    delaunay_graph = nx.Graph()
+    delaunay_graph.add_nodes_from((node, {'pos': value}) for node, value in enumerate(coordinates))
+    delaunay_graph.add_edges_from(edges)
+
+    return delaunay_graph
+
+
 def __assert_crossing_equality__(g, crossing_list, include_rotation: bool = False,
                                  include_node_crossings: bool = False):
     crossing_test_helper.assert_crossing_equality(g, crossing_list, crossings.get_crossings, include_rotation,
@@ -804,22 +828,8 @@ class TestComplexCrossingScenarios(unittest.TestCase):
 
 
     def test_random_planar_graphs(self):
-
         for i in range(10, 50):
-            n = i*5
-            coordinates = [(random.uniform(0, 1), random.uniform(0, 1)) for _ in range(0, n)]
-
-            # Generate delaunay
-            cells, generators = voronoi_frames(coordinates, clip="convex hull")
-            delaunay = weights.Rook.from_dataframe(cells)
-            delaunay_graph = delaunay.to_networkx()
-
-            pos = dict(zip(delaunay_graph.nodes, coordinates))
-
-            for node, value in pos.items():
-                delaunay_graph.nodes[node]['pos'] = value
-
-            __assert_crossing_equality__(delaunay_graph, [])
+            __assert_crossing_equality__(__random_planar_graph__(i * 5, 10023548 + i), [])
 
 
 class TestDatasetGraphs(object):
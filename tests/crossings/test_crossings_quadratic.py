@@ -447,6 +447,15 @@ class TestCrossingsInvolvingVertices(unittest.TestCase):
 
 class TestOverlappingCrossings(unittest.TestCase):
 
+    def test_overlapping_diagonal_crossing(self):
+        g = nx.Graph()
+        g.add_node(1, pos=(0, 0))
+        g.add_node(2, pos=(4, 6))
+        g.add_node(3, pos=(8, 12))
+        g.add_node(4, pos=(2, 3))
+        g.add_edges_from([(1, 2), (3, 4)])
+        __assert_crossing_equality__(g, [crossings.Crossing(crossings.CrossingLine((2, 3), (4, 6)), [(1, 2), (3, 4)])])
+
     def test_overlapping_crossing_1(self):
         g = nx.Graph()
         g.add_node(1, pos=(0, 0))
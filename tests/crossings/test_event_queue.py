@@ -355,3 +355,18 @@ class TestEventQueue(unittest.TestCase):
         assert len(queue) == 2
 
         crossingDataTypes.set_precision(1e-09)
+
+    def test_length_decreases_on_pop(self):
+        queue = EventQueue()
+
+        queue.add_edge(SweepLineEdgeInfo((0, 1), (0, 0), (1, 1)))
+        queue.add_edge(SweepLineEdgeInfo((2, 3), (2, 2), (3, 3)))
+
+        assert len(queue) == 4
+        queue.pop()
+        assert len(queue) == 3
+
+        while queue.pop() is not None:
+            pass
+
+        assert len(queue) == 0
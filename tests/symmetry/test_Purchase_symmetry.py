@@ -28,6 +28,7 @@ import numpy as np
 import pytest
 # noinspection PyUnresolvedReferences
 import pytest_socket
+from scipy.spatial import ConvexHull
 
 from gdMetriX import symmetry as sym
 
@@ -121,6 +122,23 @@ class TextReflectPointAroundPerpendicularBisector(unittest.TestCase):
         math.isclose(flipped[0], 1)
 
 
+class TestConvexHullArea(unittest.TestCase):
+
+    def test_square_with_inner_point(self):
+        points = np.array([[0, 0], [2, 0], [1, 1], [0, 2], [2, 2]], dtype=float)
+        assert math.isclose(sym._convex_hull_area(points), 4)
+
+    def test_collinear_points(self):
+        points = np.array([[0, 0], [1, 1], [3, 3], [1, 1]], dtype=float)
+        assert sym._convex_hull_area(points) == 0
+
+    def test_matches_qhull(self):
+        rng = np.random.default_rng(4532)
+        for size in [3, 10, sym._SMALL_HULL_SIZE, sym._SMALL_HULL_SIZE + 1]:
+            points = rng.uniform(-10, 10, (size, 2))
+            assert math.isclose(sym._convex_hull_area(points), ConvexHull(points).volume)
+
+
 class TestPurchaseSymmetry(unittest.TestCase):
 
     def test_empty_graph(self):
@@ -145,6 +163,15 @@ class TestPurchaseSymmetry(unittest.TestCase):
         print(symmetry)
         assert symmetry == 1
 
+    def test_nodes_without_edges(self):
+        g = nx.Graph()
+        g.add_node(1, pos=(1, 1))
+        g.add_node(2, pos=(4, 3))
+        g.add_node(3, pos=(-1, 2))
+        symmetry = sym.reflective_symmetry(g)
+        print(symmetry)
+        assert symmetry == 0
+
     def test_cycle_close_to_one(self):
         g = nx.Graph()
 
@@ -214,3 +241,22 @@ class TestPurchaseSymmetry(unittest.TestCase):
         symmetry = sym.reflective_symmetry(g, threshold=2, fraction=0.5)
 
         assert symmetry == 0.25
+
+    def test_worker_processes_match_sequential(self):
+        random.seed(6284)
+        half = nx.gnp_random_graph(26, 0.15, seed=7)
+
+        g = nx.Graph()
+        for node in half.nodes():
+            x, y = random.uniform(0.5, 5), random.uniform(-5, 5)
+            g.add_node(node, pos=(x, y))
+            g.add_node(node + 100, pos=(-x, y))
+        for u, v in half.edges():
+            g.add_edge(u, v)
+            g.add_edge(u + 100, v + 100)
+        g.add_edges_from([(0, 101), (2, 105)])
+
+        symmetry = sym.reflective_symmetry(g, fraction=0.5)
+        parallel_symmetry = sym.reflective_symmetry(g, fraction=0.5, n_jobs=2)
+
+        assert parallel_symmetry == pytest.approx(symmetry)
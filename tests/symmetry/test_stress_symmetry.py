@@ -18,6 +18,7 @@
     Unit tests for the stress-based symmetry metric
 """
 
+import math
 import random
 import unittest
 
@@ -53,6 +54,27 @@ class TestStressBasedSymmetry(unittest.TestCase):
         print(symmetry)
         assert symmetry == pytest.approx(0, abs=1e-05)
 
+    def test_disconnected_graph(self):
+        g = nx.Graph()
+        g.add_node(1, pos=(0, 0))
+        g.add_node(2, pos=(1, 0))
+        g.add_node(3, pos=(5, 5))
+        g.add_node(4, pos=(5, 6))
+        g.add_edges_from([(1, 2), (3, 4)])
+        symmetry = sym.stress(g, scale_minimization=False)
+        print(symmetry)
+        assert symmetry == pytest.approx(0)
+
+    def test_positions_for_some_nodes(self):
+        g = nx.path_graph(4)
+        pos = {0: (0, 0), 1: (1, 0), 2: (2, 1)}
+        # Only pairs of positioned nodes are considered, i.e. (0, 1), (0, 2) and (1, 2)
+        expected = (math.sqrt(5) / 2 - 1) ** 2 + (math.sqrt(2) - 1) ** 2
+        assert sym.stress(g, pos, scale_minimization=False) == pytest.approx(expected)
+
+        pos[2] = (2, 0)
+        assert sym.stress(g, pos) == pytest.approx(0)
+
     def test_scale_independence(self):
         random.seed(32842)
         for i in range(1, 10):
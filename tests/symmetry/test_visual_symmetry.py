@@ -140,3 +140,19 @@ class TestInHouseSymmetry(unittest.TestCase):
             print(symmetry)
 
             assert 0 <= symmetry <= 1
+
+    def test_undirected_drawing_score(self):
+        random.seed(7714)
+        g = nx.gnp_random_graph(12, 0.3, seed=7714)
+        embedding = {n: (random.uniform(-1, 1), random.uniform(-1, 1)) for n in g}
+
+        # Score of the drawing rendered entirely by matplotlib
+        assert sym.visual_symmetry(g, embedding) == pytest.approx(0.4305762907615295, abs=0.02)
+
+    def test_directed_drawing_score(self):
+        random.seed(5190)
+        g = nx.gnp_random_graph(12, 0.25, seed=5190, directed=True)
+        embedding = {n: (random.uniform(-1, 1), random.uniform(-1, 1)) for n in g}
+
+        # Score of the drawing rendered entirely by matplotlib, including arrowheads
+        assert sym.visual_symmetry(g, embedding) == pytest.approx(0.3850819681953124, abs=0.02)
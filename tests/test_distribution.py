@@ -1011,6 +1011,34 @@ class TestSmallestEnclosingCircle(unittest.TestCase):
             assert center.y == pytest.approx(size / 2)
             assert radius == pytest.approx(size * math.sqrt(2) / 2)
 
+    def test_collinear_grid(self):
+        random.seed(8231)
+
+        for _ in range(0, 20):
+            g = nx.Graph()
+            for i in range(0, 7):
+                for j in range(0, 7):
+                    g.add_node((i, j), pos=(i - 3, j - 3))
+
+            center, radius = distribution.smallest_enclosing_circle(g)
+            print(center, radius)
+            assert center.x == pytest.approx(0)
+            assert center.y == pytest.approx(0)
+            assert radius == pytest.approx(3 * math.sqrt(2))
+
+    def test_many_points(self):
+        random.seed(923)
+        g = nx.Graph()
+        for node in range(0, 5000):
+            g.add_node(node, pos=(random.uniform(-1, 1), random.uniform(-1, 1)))
+        g.add_node(5000, pos=(10, 0))
+        g.add_node(5001, pos=(-10, 0))
+
+        center, radius = distribution.smallest_enclosing_circle(g)
+        assert center.x == pytest.approx(0)
+        assert center.y == pytest.approx(0)
+        assert radius == pytest.approx(10)
+
     def test_random_embedding_all_nodes_contained(self):
 
         for _ in range(0, 100):
@@ -1029,3 +1057,32 @@ class TestSmallestEnclosingCircle(unittest.TestCase):
                 print(node)
                 point = Vector(pos[node][0], pos[node][1])
                 assert point.distance(center) <= radius + 1e-06
+
+    def test_coincident_nodes(self):
+        g = nx.Graph()
+        g.add_node(0, pos=(0, 0))
+        g.add_node(1, pos=(0, 0))
+        g.add_node(2, pos=(4, 0))
+        g.add_node(3, pos=(4, 0))
+        g.add_node(4, pos=(2, 1))
+
+        center, radius = distribution.smallest_enclosing_circle(g)
+        assert center.x == pytest.approx(2)
+        assert center.y == pytest.approx(0)
+        assert radius == pytest.approx(2)
+
+    def test_random_grid_all_nodes_contained(self):
+        random.seed(3617)
+
+        for _ in range(0, 500):
+            g = nx.Graph()
+            # Small grids produce many coincident and co-circular nodes
+            for node in range(0, random.randint(1, 40)):
+                g.add_node(node, pos=(random.randint(0, 5), random.randint(0, 5)))
+
+            center, radius = distribution.smallest_enclosing_circle(g)
+
+            pos = get_node_positions(g)
+            for node in g.nodes:
+                point = Vector(pos[node][0], pos[node][1])
+                assert point.distance(center) <= radius + 1e-09
@@ -156,6 +156,16 @@ class TestAverageFlow(unittest.TestCase):
 
         assert average_flow is None
 
+    def test_directed_view(self):
+        g = nx.Graph()
+        g.add_node(1, pos=(21, 29))
+        g.add_node(2, pos=(0, 0))
+        g.add_node(3, pos=(12, 0.4))
+        g.add_edges_from([(1, 2), (1, 3)])
+
+        # The metric only reads the graph, so a directed view can be passed without copying
+        assert edge_directions.average_flow(g.to_directed(as_view=True)) == edge_directions.average_flow(nx.DiGraph(g))
+
     def test_opposite_vectors(self):
         g = nx.DiGraph()
         g.add_node(1, pos=(-1, -1))
@@ -252,6 +262,16 @@ class TestAverageFlow(unittest.TestCase):
 
         assert coherence is None
 
+    def test_coherence_to_average_flow_equals_upwards_flow_of_average_flow(self):
+        for seed in range(20):
+            g = nx.gnp_random_graph(15, 0.2, seed=seed, directed=True)
+            pos = nx.random_layout(g, seed=seed)
+
+            coherence = edge_directions.coherence_to_average_flow(g, pos)
+            expected = edge_directions.upwards_flow(g, pos, edge_directions.average_flow(g, pos))
+
+            assert coherence == expected
+
 
 class TestMinimumAngle(unittest.TestCase):
 
@@ -317,6 +337,23 @@ class TestMinimumAngle(unittest.TestCase):
             min_angle = edge_directions.minimum_angle(g)
             assert math.isclose(min_angle, min(math.radians(i), math.radians(360 - i)))
 
+    def test_shallow_angle_at_low_degree_node(self):
+        # The optimal angle 360°/deg(v) of a node does not bound its actual minimum angle from below, so low-degree
+        # nodes must not be skipped even if a high-degree node already yields a small angle
+        g = nx.Graph()
+        g.add_node('center', pos=(0, 0))
+        for i in range(8):
+            g.add_node(i, pos=(math.sin(math.radians(i * 45)), math.cos(math.radians(i * 45))))
+            g.add_edge('center', i)
+
+        g.add_node('a', pos=(10, 0))
+        g.add_node('b', pos=(11, 0))
+        g.add_node('c', pos=(10 + math.cos(math.radians(10)), math.sin(math.radians(10))))
+        g.add_edges_from([('a', 'b'), ('a', 'c')])
+
+        min_angle = edge_directions.minimum_angle(g, deg=True)
+        assert math.isclose(min_angle, 10)
+
 
 class TestAngularResolution(unittest.TestCase):
     def test_empty_graph(self):
@@ -385,6 +422,16 @@ class TestAngularResolution(unittest.TestCase):
         resolution = edge_directions.angular_resolution(g)
         assert math.isclose(resolution, 0.25)
 
+    def test_degrees(self):
+        g = nx.Graph()
+        g.add_node(1, pos=(0, 0))
+        g.add_node(2, pos=(1, 0))
+        g.add_node(3, pos=(math.cos(math.radians(45)), math.sin(math.radians(45))))
+        g.add_node(4, pos=(0, -1))
+        g.add_edges_from([(1, 2), (1, 3), (1, 4), (2, 3)])
+
+        assert math.isclose(edge_directions.angular_resolution(g, deg=True), edge_directions.angular_resolution(g))
+
 
 class TestEdgeOrthogonality(unittest.TestCase):
 
@@ -45,6 +45,18 @@ class TestCombinatorialEmbedding(unittest.TestCase):
         assert len(embedding['center']) == 35
         assert embedding['center'] == sorted(range(1, 36))
 
+    def test_large_star(self):
+        g = nx.Graph()
+        g.add_node('center', pos=(0, 0))
+
+        for i in range(1, 360):
+            g.add_node(i, pos=(math.sin(math.radians(i)), math.cos(math.radians(i))))
+            g.add_edge('center', i)
+
+        embedding = edge_directions.combinatorial_embedding(g)
+
+        assert embedding['center'] == list(range(1, 360))
+
     def test_multigraph(self):
         g = nx.MultiGraph()
         g.add_node(0, pos=(0, 0))
@@ -72,6 +84,12 @@ class TestCombinatorialEmbedding(unittest.TestCase):
         assert len(embedding) == 2
         assert len(embedding[0]) == 1
 
+    def test_parallel_embedding(self):
+        g = nx.random_geometric_graph(1200, 0.05, seed=42)
+
+        assert (edge_directions.combinatorial_embedding(g, n_jobs=2) ==
+                edge_directions.combinatorial_embedding(g))
+
 
 class TestEdgeAngles(unittest.TestCase):
 
@@ -141,3 +159,18 @@ class TestEdgeAngles(unittest.TestCase):
 
         assert len(angles) == 1
         assert math.isclose(angles[0], 360)
+
+    def test_precomputed_embedding(self):
+        g = nx.Graph()
+        g.add_node(1, pos=(0, 0))
+        g.add_node(2, pos=(-0.5, 1))
+        g.add_node(3, pos=(+0.5, 1))
+        g.add_node(4, pos=(1, 0))
+        g.add_node(5, pos=(-1, 0))
+        g.add_edges_from([(1, 2), (1, 3), (1, 4), (1, 5)])
+
+        embedding = edge_directions.combinatorial_embedding(g)
+
+        for node in g.nodes():
+            assert (edge_directions.edge_angles(g, node, deg=True, sorted_adj=embedding) ==
+                    edge_directions.edge_angles(g, node, deg=True))